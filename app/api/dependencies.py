@@ -4,7 +4,7 @@ Creates and wires all application components.
 Uses FastAPI's dependency injection system.
 """
 from functools import lru_cache
-from typing import Generator
+from typing import Dict, Generator
 
 from app.config import Settings, get_settings
 from app.core.cache import InMemoryCache
@@ -16,7 +16,7 @@ from app.repositories.memory import (
 )
 from app.services.feature_flags import ConfigBasedFeatureFlagService
 from app.services.feed import FeedService
-from app.services.ranking import RankingEngine
+from app.services.ranking import RankingEngine, ScoredPool
 
 
 # =============================================================================
@@ -50,8 +50,19 @@ def get_feature_flag_service() -> ConfigBasedFeatureFlagService:
 
 @lru_cache()
 def get_ranking_engine() -> RankingEngine:
-    """Get singleton ranking engine."""
-    return RankingEngine()
+    """
+    Get singleton ranking engine.
+    Scored pools are cached per user + candidate list, so paging through a
+    feed filters and scores the candidates once per TTL window.
+    """
+    settings = get_settings()
+    return RankingEngine(
+        debug_breakdown=settings.DEBUG,
+        page_cache=InMemoryCache[ScoredPool](
+            default_ttl_seconds=settings.RANKING_PAGE_CACHE_TTL_SEC,
+            max_entries=settings.RANKING_PAGE_CACHE_MAX_ENTRIES,
+        ),
+    )
 
 
 @lru_cache()
@@ -65,15 +76,29 @@ def get_ranking_circuit_breaker() -> CircuitBreaker:
     )
 
 
-# =============================================================================
-# Request-Scoped Dependencies (Per-Request Lifetime)
-# =============================================================================
+@lru_cache()
+def get_etag_cache() -> InMemoryCache[Dict[str, str]]:
+    """
+    Get singleton cache of feed validator headers (ETag, Cache-Control, ...).
+    Entries live as long as the client-side max-age, so a repeated request
+    within that window reuses the ETag instead of re-hashing the items.
+    Bounded so that per-user keys cannot grow the cache without limit.
+    """
+    settings = get_settings()
+    return InMemoryCache[Dict[str, str]](
+        default_ttl_seconds=settings.CANDIDATE_FEED_TTL,
+        max_entries=settings.ETAG_CACHE_MAX_ENTRIES,
+    )
 
 
+@lru_cache()
 def get_feed_service() -> FeedService:
     """
-    Get feed service with all dependencies wired.
+    Get singleton feed service with all dependencies wired.
     This is the main entry point for the feed endpoint.
+
+    All collaborators are singletons, so the service itself is stateless
+    per request and one instance is shared across requests.
     """
     return FeedService(
         user_signal_repo=get_user_signal_repository(),
@@ -98,3 +123,5 @@ def clear_caches() -> None:
     get_feature_flag_service.cache_clear()
     get_ranking_engine.cache_clear()
     get_ranking_circuit_breaker.cache_clear()
+    get_etag_cache.cache_clear()
+    get_feed_service.cache_clear()
@@ -2,14 +2,14 @@
 Feed API router.
 Implements GET /v1/feed endpoint with proper error handling and headers.
 """
-import hashlib
 import logging
-from typing import Optional
+from typing import Dict, Optional
 
-from fastapi import APIRouter, Depends, Header, Query, Response, status
+from fastapi import APIRouter, Header, Query, Request, Response, status
+import xxhash
 
-from app.api.dependencies import get_feed_service
 from app.config import get_settings
+from app.core.cache import InMemoryCache
 from app.models.schemas import FeedResponse
 from app.services.feed import FeedService
 
@@ -17,6 +17,46 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/v1", tags=["feed"])
 
+# Static limits are bound once at import time to keep get_settings() off the hot path
+_MAX_FEED_LIMIT = get_settings().MAX_FEED_LIMIT
+
+# Cache-Control/Vary header sets, precomputed per response variant
+# 1. Personalized (Standard): Private, short TTL
+_HDRS_PERSONAL = {
+    "Cache-Control": "private, max-age=30",
+    "Vary": "X-User-Hash",
+}
+# 2. Fallback / Degraded: Public, short TTL + SWR.
+#    Public cache should NOT vary by User Hash.
+_HDRS_FALLBACK = {
+    "Cache-Control": "public, max-age=30, stale-while-revalidate=15",
+    "Vary": "Accept-Encoding",
+}
+
+# Header values for the X-Personalized debug header
+_BOOL_STR = {True: "true", False: "false"}
+
+
+def _strip_weak(etag: str) -> str:
+    """Strip the weak validator prefix from an ETag."""
+    return etag[2:] if etag.startswith("W/") else etag
+
+
+def _etag_matches(if_none_match: Optional[str], etag: Optional[str]) -> bool:
+    """
+    Evaluate If-None-Match using weak comparison (RFC 7232 section 2.3.2).
+    Supports the "*" wildcard and comma-separated lists of ETags.
+    """
+    if not if_none_match or not etag:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    target = _strip_weak(etag)
+    return any(
+        _strip_weak(candidate.strip()) == target
+        for candidate in if_none_match.split(",")
+    )
+
 
 @router.get(
     "/feed",
@@ -43,7 +83,7 @@ router = APIRouter(prefix="/v1", tags=["feed"])
     },
 )
 async def get_feed(
-    response: Response,
+    request: Request,
     limit: int = Query(
         default=20,
         ge=1,
@@ -68,20 +108,43 @@ async def get_feed(
         default=None,
         description="ETag from previous response",
     ),
-    feed_service: FeedService = Depends(get_feed_service),
-) -> FeedResponse:
+) -> Response:
     """
     Get personalized feed endpoint.
 
     This is the main SDK-facing endpoint for retrieving ranked video content.
+    Services are resolved from app.state (wired at startup) rather than via
+    Depends, keeping dependency resolution off the hot path.
     """
-    settings = get_settings()
-
+    feed_service: FeedService = request.app.state.feed_service
+    etag_cache: InMemoryCache[Dict[str, str]] = request.app.state.etag_cache
     # Enforce limit from settings
-    effective_limit = min(limit, settings.MAX_FEED_LIMIT)
+    effective_limit = min(limit, _MAX_FEED_LIMIT)
+
+    # -------------------------------------------------------------------------
+    # Conditional Request Short-Circuit
+    # -------------------------------------------------------------------------
+    # Headers of the last response served for an identical request, candidate
+    # version and response variant (kill switch / flags / circuit state) are
+    # cached; their ETag hashes the items actually served. A conditional GET
+    # matching it skips the feed service and gets the same validator and
+    # caching headers. Entries live for the client max-age window.
+    variant = feed_service.get_response_variant(x_tenant_id, user_hash)
+    etag_key = (
+        f"{x_tenant_id}|{user_hash}|{cursor}|{effective_limit}|"
+        f"{feed_service.get_feed_version()}|{variant}"
+    )
+    cached_headers = etag_cache.get(etag_key)
+    if cached_headers is not None and _etag_matches(
+        if_none_match, cached_headers.get("ETag")
+    ):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED,
+            headers=cached_headers,
+        )
 
     # Call feed service
-    feed_response = await feed_service.get_feed(
+    feed_response, served_variant = await feed_service.get_feed_with_variant(
         tenant_id=x_tenant_id,
         user_hash=user_hash,
         limit=effective_limit,
@@ -89,35 +152,47 @@ async def get_feed(
     )
 
     # -------------------------------------------------------------------------
-    # ETag / 304 Logic
+    # Cache-Control Logic
     # -------------------------------------------------------------------------
-    etag: Optional[str] = None
-    if feed_response.items:
-        # Calculate weak ETag based on item IDs
-        content_str = "".join([item.id for item in feed_response.items])
-        etag_hash = hashlib.md5(content_str.encode()).hexdigest()[:16]
-        etag = f'W/"{etag_hash}"'
-        response.headers["ETag"] = etag
+    # Copied: the per-response dict is cached alongside its ETag below
+    headers: Dict[str, str] = dict(
+        _HDRS_PERSONAL
+        if feed_response.is_personalized and not feed_response.degraded
+        else _HDRS_FALLBACK
+    )
 
-    # Check for cache hit
-    if if_none_match and etag and if_none_match == etag:
-        return Response(status_code=status.HTTP_304_NOT_MODIFIED)
+    # Debug header
+    headers["X-Personalized"] = _BOOL_STR[feed_response.is_personalized]
 
     # -------------------------------------------------------------------------
-    # Cache-Control Logic
+    # ETag / 304 Logic
     # -------------------------------------------------------------------------
-    # 1. Personalized (Standard): Private, short TTL
-    if feed_response.is_personalized and not feed_response.degraded:
-        response.headers["Cache-Control"] = "private, max-age=30"
-        response.headers["Vary"] = "X-User-Hash"
-    
-    # 2. Fallback / Degraded: Public, short TTL + SWR
-    else:
-        response.headers["Cache-Control"] = "public, max-age=30, stale-while-revalidate=15"
-        # Public cache should NOT vary by User Hash
-        response.headers["Vary"] = "Accept-Encoding"
-
-    # Debug header
-    response.headers["X-Personalized"] = str(feed_response.is_personalized).lower()
+    if feed_response.items:
+        # Weak ETag of the item IDs being served, hashed incrementally
+        hasher = xxhash.xxh3_64()
+        update = hasher.update
+        for item in feed_response.items:
+            update(item.id.encode("utf-8"))
+        headers["ETag"] = f'W/"{hasher.hexdigest()}"'
+
+    # Only cache under the predicted variant when the service served that
+    # variant (e.g. not a fallback after a ranking failure); otherwise drop
+    # the entry so it cannot keep answering 304 for what is now served
+    if served_variant == variant and "ETag" in headers:
+        etag_cache.set(etag_key, headers)
+    elif cached_headers is not None:
+        etag_cache.delete(etag_key)
 
-    return feed_response
+    # Check for cache hit
+    if _etag_matches(if_none_match, headers.get("ETag")):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED,
+            headers=headers,
+        )
+
+    # Serialize with pydantic-core directly (bypasses jsonable_encoder + json)
+    return Response(
+        content=feed_response.model_dump_json(),
+        media_type="application/json",
+        headers=headers,
+    )
@@ -1,10 +1,10 @@
 """
 Health check router for observability.
 """
-from fastapi import APIRouter
+from fastapi import APIRouter, Request
 
-from app.api.dependencies import get_ranking_circuit_breaker
-from app.config import get_settings
+from app.config import Settings
+from app.core.circuit_breaker import CircuitBreaker
 
 router = APIRouter(tags=["health"])
 
@@ -16,13 +16,13 @@ async def health_check() -> dict:
 
 
 @router.get("/health/ready", summary="Readiness Check")
-async def readiness_check() -> dict:
+async def readiness_check(request: Request) -> dict:
     """
     Readiness check for Kubernetes.
     Returns status of circuit breakers and dependencies.
     """
-    circuit_breaker = get_ranking_circuit_breaker()
-    settings = get_settings()
+    circuit_breaker: CircuitBreaker = request.app.state.circuit_breaker
+    settings: Settings = request.app.state.settings
 
     return {
         "status": "ready",
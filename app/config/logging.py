@@ -2,21 +2,10 @@
 Structured logging configuration.
 Outputs logs in JSON format for production observability.
 """
-import json
 import logging
 import sys
-from typing import Any, Dict
 
-from pydantic import BaseModel
-
-
-class LogRecord(BaseModel):
-    """Structured log record schema."""
-    timestamp: str
-    level: str
-    logger: str
-    message: str
-    context: Dict[str, Any]
+import orjson
 
 
 class JsonFormatter(logging.Formatter):
@@ -41,7 +30,7 @@ class JsonFormatter(logging.Formatter):
         if hasattr(record, "tenant_id"):
             log_obj["tenant_id"] = getattr(record, "tenant_id")
 
-        return json.dumps(log_obj)
+        return orjson.dumps(log_obj).decode("utf-8")
 
 
 def configure_logging(debug: bool = False) -> None:
@@ -25,6 +25,7 @@ class Settings(BaseSettings):
     
     # Cache Configuration
     CANDIDATE_FEED_TTL: int = 30  # Seconds
+    ETAG_CACHE_MAX_ENTRIES: int = 4096
     
     # Telemetry
     ENABLE_OTEL: bool = False  # Default to False to prevent gRPC errors in dev
@@ -48,6 +49,11 @@ class Settings(BaseSettings):
     DEFAULT_FEED_LIMIT: int = 20
     MAX_FEED_LIMIT: int = 50
 
+    # Ranking
+    MAX_RANKING_CANDIDATES: int = 200  # Candidate pool bound per request
+    RANKING_PAGE_CACHE_TTL_SEC: int = 30  # Scored pools reused across pages
+    RANKING_PAGE_CACHE_MAX_ENTRIES: int = 4096
+
     # Rate Limiting
     RATE_LIMIT_REQUESTS_PER_SEC: int = 2
 
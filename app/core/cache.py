@@ -2,14 +2,23 @@
 Generic in-memory cache with TTL support.
 Thread-safe and suitable for L1 caching.
 Can be replaced with Redis adapter for production.
+
+Methods are intentionally synchronous: they do no IO and only hold a lock
+for a dict operation, so async code calls them directly rather than
+dispatching through a threadpool.
 """
+import heapq
 import time
 from abc import ABC, abstractmethod
 from threading import Lock
-from typing import Callable, Dict, Generic, Optional, TypeVar
+from typing import Callable, Dict, Generic, List, Optional, Tuple, TypeVar
 
 T = TypeVar("T")
 
+# Per-shard (expires_at, key) min-heap; may hold stale pairs for keys since
+# overwritten or deleted, which cleanup skips by comparing expires_at
+ExpiryHeap = List[Tuple[float, str]]
+
 
 class CacheInterface(ABC, Generic[T]):
     """Abstract interface for cache implementations."""
@@ -48,61 +57,127 @@ class CacheInterface(ABC, Generic[T]):
 class CacheEntry(Generic[T]):
     """Single cache entry with expiration tracking."""
 
+    __slots__ = ("value", "expires_at")
+
     def __init__(self, value: T, expires_at: Optional[float]) -> None:
         self.value = value
         self.expires_at = expires_at
 
-    def is_expired(self) -> bool:
-        """Check if entry has expired."""
-        if self.expires_at is None:
-            return False
-        return time.time() > self.expires_at
-
 
 class InMemoryCache(CacheInterface[T]):
     """
     Thread-safe in-memory cache with TTL support.
 
+    Keys are spread over a fixed number of shards, each with its own dict and
+    lock, so concurrent requests touching different keys do not contend.
+    An optional max_entries bound evicts the least recently written entries.
+    Expired entries are dropped lazily on read; each shard also keeps an
+    expiry heap so cleanup_expired only visits entries that have expired.
+
     Usage:
         cache: CacheInterface[UserSignals] = InMemoryCache(default_ttl=300)
         signals = cache.get_or_set("user_123", lambda: fetch_signals("user_123"))
     """
 
-    def __init__(self, default_ttl_seconds: Optional[int] = None) -> None:
-        self._store: Dict[str, CacheEntry[T]] = {}
+    NUM_SHARDS = 16  # Must be a power of two (used as a bit mask)
+
+    def __init__(
+        self,
+        default_ttl_seconds: Optional[int] = None,
+        max_entries: Optional[int] = None,
+    ) -> None:
+        self._shards: List[Tuple[Dict[str, CacheEntry[T]], Lock, ExpiryHeap]] = [
+            ({}, Lock(), []) for _ in range(self.NUM_SHARDS)
+        ]
         self._default_ttl = default_ttl_seconds
-        self._lock = Lock()
+        # Bound is enforced per shard (rounded up)
+        self._max_per_shard = (
+            -(-max_entries // self.NUM_SHARDS) if max_entries else None
+        )
+
+    def _shard(
+        self, key: str
+    ) -> Tuple[Dict[str, CacheEntry[T]], Lock, ExpiryHeap]:
+        """Return the (store, lock, expiry heap) shard owning this key."""
+        return self._shards[hash(key) & (self.NUM_SHARDS - 1)]
 
     def get(self, key: str) -> Optional[T]:
-        """Get value by key, returns None if not found or expired."""
-        with self._lock:
-            entry = self._store.get(key)
-            if entry is None:
-                return None
-            if entry.is_expired():
-                del self._store[key]
-                return None
-            return entry.value
+        """
+        Get value by key, returns None if not found or expired.
+
+        Hits are lock-free: dict.get is atomic under the GIL. A read racing
+        with a concurrent set may observe the previous value once, which is
+        acceptable for this cache. Dropping an expired entry takes the shard
+        lock, so every mutation of a shard is serialized.
+        """
+        # Shard lookup and expiry check are inlined: this is called on every
+        # repository read, so avoid the extra Python frames
+        store = self._shards[hash(key) & (self.NUM_SHARDS - 1)][0]
+        entry = store.get(key)
+        if entry is None:
+            return None
+        expires_at = entry.expires_at
+        if expires_at is not None and time.monotonic() > expires_at:
+            self._drop_expired(key, entry)
+            return None
+        return entry.value
+
+    def _drop_expired(self, key: str, entry: CacheEntry[T]) -> None:
+        """Remove an expired entry unless a concurrent set replaced it."""
+        store, lock, _ = self._shard(key)
+        with lock:
+            if store.get(key) is entry:
+                del store[key]
 
     def set(self, key: str, value: T, ttl_seconds: Optional[int] = None) -> None:
         """Set value with optional TTL."""
         ttl = ttl_seconds if ttl_seconds is not None else self._default_ttl
-        expires_at = time.time() + ttl if ttl else None
-        with self._lock:
-            self._store[key] = CacheEntry(value, expires_at)
+        expires_at = time.monotonic() + ttl if ttl else None
+        store, lock, heap = self._shard(key)
+        with lock:
+            self._store_locked(store, heap, key, value, expires_at)
+
+    def _store_locked(
+        self,
+        store: Dict[str, CacheEntry[T]],
+        heap: ExpiryHeap,
+        key: str,
+        value: T,
+        expires_at: Optional[float],
+    ) -> None:
+        """Insert into a shard; caller holds the shard lock."""
+        # Re-insert so dict order tracks write recency
+        if store.pop(key, None) is None and self._max_per_shard is not None:
+            while len(store) >= self._max_per_shard:
+                del store[next(iter(store))]
+        store[key] = CacheEntry(value, expires_at)
+        if expires_at is not None:
+            heapq.heappush(heap, (expires_at, key))
+            # Overwrites leave stale pairs behind; rebuild before the heap
+            # outgrows the live entries (amortized O(1) per set)
+            if len(heap) > 2 * len(store) + 64:
+                heap[:] = [
+                    (entry.expires_at, k)
+                    for k, entry in store.items()
+                    if entry.expires_at is not None
+                ]
+                heapq.heapify(heap)
 
     def delete(self, key: str) -> bool:
         """Delete key, returns True if existed."""
-        with self._lock:
-            if key in self._store:
-                del self._store[key]
+        store, lock, _ = self._shard(key)
+        with lock:
+            if key in store:
+                del store[key]
                 return True
             return False
 
     def clear(self) -> None:
         """Clear all entries."""
-        with self._lock:
-            self._store.clear()
+        for store, lock, heap in self._shards:
+            with lock:
+                store.clear()
+                heap.clear()
 
     def get_or_set(
         self,
@@ -110,29 +185,57 @@ class InMemoryCache(CacheInterface[T]):
         factory: Callable[[], T],
         ttl_seconds: Optional[int] = None,
     ) -> T:
-        """Get value or compute and cache it if missing."""
-        value = self.get(key)
-        if value is not None:
-            return value
+        """
+        Get value or compute and cache it if missing.
+
+        A hit costs one dict lookup (cached None values count as hits). The
+        factory runs outside the lock; if another caller stored a fresh value
+        meanwhile, that value wins so all callers observe the same one.
+        """
+        store, lock, heap = self._shard(key)
+        entry = store.get(key)
+        if entry is not None and (
+            entry.expires_at is None or time.monotonic() <= entry.expires_at
+        ):
+            return entry.value
 
-        # Compute outside lock to avoid blocking
+        # Compute outside lock to avoid blocking the shard
         computed_value = factory()
-        self.set(key, computed_value, ttl_seconds)
+        ttl = ttl_seconds if ttl_seconds is not None else self._default_ttl
+        with lock:
+            now = time.monotonic()
+            entry = store.get(key)
+            if entry is not None and (
+                entry.expires_at is None or now <= entry.expires_at
+            ):
+                return entry.value
+            self._store_locked(
+                store, heap, key, computed_value, now + ttl if ttl else None
+            )
         return computed_value
 
     def size(self) -> int:
         """Return number of entries (including possibly expired)."""
-        with self._lock:
-            return len(self._store)
+        total = 0
+        for store, lock, _ in self._shards:
+            with lock:
+                total += len(store)
+        return total
 
     def cleanup_expired(self) -> int:
-        """Remove expired entries, return count removed."""
+        """
+        Remove expired entries, return count removed.
+        Pops only expired heap pairs: O(k log N) for k expirations.
+        """
         removed = 0
-        with self._lock:
-            expired_keys = [
-                k for k, v in self._store.items() if v.is_expired()
-            ]
-            for key in expired_keys:
-                del self._store[key]
-                removed += 1
+        now = time.monotonic()
+        for store, lock, heap in self._shards:
+            with lock:
+                while heap and heap[0][0] < now:
+                    expires_at, key = heapq.heappop(heap)
+                    entry = store.get(key)
+                    # Skip stale pairs (key overwritten or already removed)
+                    if entry is not None and entry.expires_at == expires_at:
+                        del store[key]
+                        removed += 1
         return removed
@@ -5,7 +5,7 @@ Prevents cascading failures by stopping calls to failing services.
 import time
 from enum import Enum
 from threading import Lock
-from typing import Callable, TypeVar, Optional
+from typing import Any, Callable, TypeVar, Optional
 import logging
 
 from app.core.exceptions import CircuitBreakerOpenError
@@ -28,7 +28,7 @@ class CircuitBreaker:
 
     Usage:
         breaker = CircuitBreaker("ranking_service", failure_threshold=5)
-        result = breaker.call(lambda: ranking_service.rank(videos))
+        result = breaker.call(ranking_service.rank, videos, fallback=fallback_fn)
     """
 
     def __init__(
@@ -56,13 +56,21 @@ class CircuitBreaker:
         """Circuit breaker name."""
         return self._name
 
-    def call(self, func: Callable[[], T], fallback: Optional[Callable[[], T]] = None) -> T:
+    def call(
+        self,
+        func: Callable[..., T],
+        *args: Any,
+        fallback: Optional[Callable[..., T]] = None,
+        **kwargs: Any,
+    ) -> T:
         """
         Execute function through circuit breaker.
 
         Args:
             func: The function to execute
-            fallback: Optional fallback if circuit is open
+            *args, **kwargs: Arguments forwarded to func (and to fallback),
+                so callers can pass bound methods without building closures
+            fallback: Optional fallback if circuit is open or func fails
 
         Returns:
             Result from func or fallback
@@ -70,54 +78,63 @@ class CircuitBreaker:
         Raises:
             CircuitBreakerOpenError: If open and no fallback provided
         """
-        with self._lock:
-            if self._state == CircuitState.OPEN:
-                if self._should_attempt_reset():
+        # Fast path: reading the state is atomic, only transitions take the lock
+        if self._state is CircuitState.OPEN:
+            with self._lock:
+                if self._state is CircuitState.OPEN and self._should_attempt_reset():
                     self._state = CircuitState.HALF_OPEN
-                    logger.info(f"Circuit breaker '{self._name}' entering HALF_OPEN")
-                else:
-                    if fallback:
-                        logger.warning(f"Circuit breaker '{self._name}' OPEN, using fallback")
-                        return fallback()
-                    raise CircuitBreakerOpenError(self._name)
+                    logger.info("Circuit breaker '%s' entering HALF_OPEN", self._name)
+                is_open = self._state is CircuitState.OPEN
+
+            if is_open:
+                if fallback:
+                    logger.warning("Circuit breaker '%s' OPEN, using fallback", self._name)
+                    return fallback(*args, **kwargs)
+                raise CircuitBreakerOpenError(self._name)
 
         try:
-            result = func()
+            result = func(*args, **kwargs)
             self._on_success()
             return result
         except Exception as e:
             self._on_failure()
             if fallback:
-                logger.warning(f"Circuit breaker '{self._name}' caught error, using fallback: {e}")
-                return fallback()
+                logger.warning(
+                    "Circuit breaker '%s' caught error, using fallback: %s", self._name, e
+                )
+                return fallback(*args, **kwargs)
             raise
 
     def _on_success(self) -> None:
         """Handle successful call."""
+        # Steady state (CLOSED, no recent failures) needs no bookkeeping
+        if self._state is CircuitState.CLOSED and self._failure_count == 0:
+            return
         with self._lock:
             self._failure_count = 0
-            if self._state == CircuitState.HALF_OPEN:
+            if self._state is CircuitState.HALF_OPEN:
                 self._state = CircuitState.CLOSED
-                logger.info(f"Circuit breaker '{self._name}' recovered to CLOSED")
+                logger.info("Circuit breaker '%s' recovered to CLOSED", self._name)
 
     def _on_failure(self) -> None:
         """Handle failed call."""
         with self._lock:
             self._failure_count += 1
-            self._last_failure_time = time.time()
+            self._last_failure_time = time.monotonic()
 
             if self._failure_count >= self._failure_threshold:
                 self._state = CircuitState.OPEN
                 logger.error(
-                    f"Circuit breaker '{self._name}' OPENED after "
-                    f"{self._failure_count} failures"
+                    "Circuit breaker '%s' OPENED after %d failures",
+                    self._name,
+                    self._failure_count,
                 )
 
     def _should_attempt_reset(self) -> bool:
         """Check if enough time has passed to attempt recovery."""
         if self._last_failure_time is None:
             return True
-        elapsed = time.time() - self._last_failure_time
+        elapsed = time.monotonic() - self._last_failure_time
         return elapsed >= self._recovery_timeout_sec
 
     def reset(self) -> None:
@@ -126,4 +143,4 @@ class CircuitBreaker:
             self._state = CircuitState.CLOSED
             self._failure_count = 0
             self._last_failure_time = None
-            logger.info(f"Circuit breaker '{self._name}' manually reset")
+            logger.info("Circuit breaker '%s' manually reset", self._name)
@@ -9,6 +9,11 @@ from typing import AsyncGenerator
 from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
 
+from app.api.dependencies import (
+    get_etag_cache,
+    get_feed_service,
+    get_ranking_circuit_breaker,
+)
 from app.api.routers import feed_router, health_router
 from app.config import get_settings
 from app.config.logging import configure_logging
@@ -32,6 +37,12 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     logger.info(f"Personalization enabled: {settings.PERSONALIZATION_ENABLED}")
     logger.info(f"Kill switch active: {settings.KILL_SWITCH_ACTIVE}")
 
+    # Wire request-path services once; handlers read them from app.state
+    app.state.settings = settings
+    app.state.feed_service = get_feed_service()
+    app.state.etag_cache = get_etag_cache()
+    app.state.circuit_breaker = get_ranking_circuit_breaker()
+
     yield
 
     # Shutdown
@@ -6,11 +6,13 @@ from .interfaces import (
     UserSignalRepository,
 )
 from .schemas import (
+    CompiledRankingRules,
     ErrorResponse,
     FeedItem,
     FeedRequest,
     FeedResponse,
     ScoredVideo,
+    TagVocabulary,
     TenantRankingRules,
     UserSignals,
     VideoMetadata,
@@ -23,11 +25,13 @@ __all__ = [
     "TenantConfigRepository",
     "UserSignalRepository",
     # Schemas
+    "CompiledRankingRules",
     "ErrorResponse",
     "FeedItem",
     "FeedRequest",
     "FeedResponse",
     "ScoredVideo",
+    "TagVocabulary",
     "TenantRankingRules",
     "UserSignals",
     "VideoMetadata",
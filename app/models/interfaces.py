@@ -47,15 +47,20 @@ class CandidateRepository(Protocol):
     Testing: In-memory mock implementation.
     """
 
-    async def get_candidates(self, tenant_id: str) -> List[VideoMetadata]:
+    async def get_candidates(
+        self,
+        tenant_id: str,
+        limit: int = 200,
+    ) -> List[VideoMetadata]:
         """
-        Fetch all active video candidates for a tenant.
+        Fetch active video candidates for a tenant.
 
         Args:
             tenant_id: Tenant identifier
+            limit: Maximum candidates to return (bounded read, e.g. LRANGE 0 limit-1)
 
         Returns:
-            List of video candidates (may be empty)
+            List of at most `limit` video candidates (may be empty)
         """
         ...
 
@@ -72,6 +77,30 @@ class CandidateRepository(Protocol):
         """
         ...
 
+    async def save_candidates(
+        self,
+        tenant_id: str,
+        videos: List[VideoMetadata],
+    ) -> None:
+        """
+        Replace the candidate pool for a tenant.
+
+        Args:
+            tenant_id: Tenant identifier
+            videos: New list of video candidates
+        """
+        ...
+
+    def get_version(self) -> int:
+        """
+        Get a monotonic version of the candidate data.
+        Bumped on every write so derived caches (e.g. ETags) can be invalidated.
+
+        Returns:
+            Current candidate data version
+        """
+        ...
+
 
 @runtime_checkable
 class TenantConfigRepository(Protocol):
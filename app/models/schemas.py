@@ -1,10 +1,79 @@
 """
-Domain models using Pydantic.
-All data structures for the personalization system.
+Domain models for the personalization system.
+Internal models are slotted dataclasses (cheap to construct and access on the
+ranking hot path); Pydantic is only used for the external API models.
 """
-from typing import Any, Dict, List, Optional
+import sys
+from dataclasses import dataclass, field, replace
+from threading import Lock
+from types import MappingProxyType
+from typing import (
+    Any,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+)
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
+
+
+# =============================================================================
+# Tag Vocabulary
+# =============================================================================
+
+class TagVocabulary:
+    """
+    Tag -> bit position table behind tag bitmasks.
+    Repositories bind copies of each tenant's pool to a fresh vocabulary on
+    load, so masks stay as narrow as that tenant's current tags; there is no
+    process-wide table. Masks are only comparable within one vocabulary.
+    Lookups are lock-free; bits are allocated under a lock so two tags never
+    share one.
+    """
+
+    __slots__ = ("_bits", "_lock")
+
+    def __init__(self) -> None:
+        self._bits: Dict[str, int] = {}
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._bits)
+
+    def mask(self, tags: Iterable[str], intern: bool = False) -> int:
+        """
+        Build a bitmask for a set of tags.
+        Unknown tags are skipped unless intern=True (no bound video carries them).
+        """
+        bits = self._bits
+        mask = 0
+        for tag in tags:
+            bit = bits.get(tag)
+            if bit is None:
+                if not intern:
+                    continue
+                with self._lock:
+                    bit = bits.get(tag)
+                    if bit is None:
+                        bit = bits[tag] = 1 << len(bits)
+            mask |= bit
+        return mask
+
+
+# Maturity rating -> ordinal (higher is more mature)
+MATURITY_INDEX: Dict[str, int] = {"G": 0, "PG": 1, "PG-13": 2, "R": 3, "NC-17": 4}
+
+# Max rating -> ratings it blocks (rows of the rating x max-rating matrix);
+# unknown video ratings are never blocked
+MATURITY_BLOCKED: Dict[str, FrozenSet[str]] = {
+    max_rating: frozenset(r for r, idx in MATURITY_INDEX.items() if idx > max_idx)
+    for max_rating, max_idx in MATURITY_INDEX.items()
+}
 
 
 # =============================================================================
@@ -12,77 +81,177 @@ from pydantic import BaseModel, Field
 # =============================================================================
 
 
-class UserSignals(BaseModel):
+@dataclass(slots=True)
+class UserSignals:
     """
     User's historical interaction data.
     Fetched from SignalStore (Redis in production).
     """
 
-    user_hash: str = Field(..., description="Anonymized user identifier")
-    watched_ids: List[str] = Field(
-        default_factory=list,
-        description="Video IDs the user has watched",
-    )
-    affinities: Dict[str, float] = Field(
-        default_factory=dict,
-        description="Category affinity scores (0.0-1.0)",
-    )
-    last_demographics: Dict[str, str] = Field(
-        default_factory=dict,
-        description="Demographic hints from SDK",
+    user_hash: str  # Anonymized user identifier
+    watched_ids: Sequence[str] = field(default_factory=list)  # Watched video IDs
+    affinities: Mapping[str, float] = field(default_factory=dict)  # Category -> 0.0-1.0
+    last_demographics: Mapping[str, str] = field(default_factory=dict)  # SDK hints
+    # Lazily built membership set, keyed on the watched_ids object it came from
+    _watched_src: Any = field(default=None, init=False, repr=False, compare=False)
+    _watched_set: FrozenSet[str] = field(
+        default=frozenset(), init=False, repr=False, compare=False
     )
+    # Lazily built affinity tag mask, keyed on affinities + tag vocabulary
+    # (and its size)
+    _affinity_key: Any = field(default=None, init=False, repr=False, compare=False)
+    _affinity_mask: int = field(default=0, init=False, repr=False, compare=False)
 
     @property
     def is_cold_start(self) -> bool:
         """Check if user has no history (cold start)."""
-        return len(self.watched_ids) == 0 and len(self.affinities) == 0
+        return not self.watched_ids and not self.affinities
+
+    @property
+    def watched_set(self) -> FrozenSet[str]:
+        """
+        watched_ids as a frozenset for O(1) membership checks.
+        Rebuilt when watched_ids is reassigned; don't mutate the list in place.
+        """
+        ids = self.watched_ids
+        if self._watched_src is not ids:
+            # Interned so probes with (interned) video ids hit the identity
+            # fast path; frozenset inputs are used as-is
+            self._watched_set = (
+                ids if type(ids) is frozenset else frozenset(map(sys.intern, ids))
+            )
+            self._watched_src = ids
+        return self._watched_set
+
+    def affinity_mask(self, vocab: TagVocabulary) -> int:
+        """
+        Mask of the affinity tags in vocab, for integer overlap tests against
+        VideoMetadata.tag_bits. Rebuilt when affinities is reassigned, for
+        another vocabulary, or when new tags are interned (a previously
+        unknown tag may now have a bit).
+        """
+        affinities = self.affinities
+        key = self._affinity_key
+        if (
+            key is None
+            or key[0] is not affinities
+            or key[1] is not vocab
+            or key[2] != len(vocab)
+        ):
+            self._affinity_mask = vocab.mask(affinities)
+            self._affinity_key = (affinities, vocab, len(vocab))
+        return self._affinity_mask
+
+    @classmethod
+    def cold_start(cls, user_hash: str) -> "UserSignals":
+        """Empty signals sharing immutable containers (no per-call allocations)."""
+        return cls(user_hash, _EMPTY_IDS, _EMPTY_MAPPING, _EMPTY_MAPPING)
 
 
-class VideoMetadata(BaseModel):
+# Shared read-only containers for cold-start users
+_EMPTY_IDS: Sequence[str] = ()
+_EMPTY_MAPPING: Mapping[str, Any] = MappingProxyType({})
+
+
+@dataclass(slots=True)
+class VideoMetadata:
     """
     Video candidate with metadata for ranking.
     Fetched from CandidateCache (Redis in production).
     """
 
-    id: str = Field(..., description="Unique video identifier")
-    title: str = Field(..., description="Video title")
-    score: float = Field(..., ge=0, le=100, description="Base popularity score")
-    tags: List[str] = Field(default_factory=list, description="Content tags")
-    maturity_rating: str = Field(default="G", description="Content rating")
-    published_at: int = Field(..., description="Unix timestamp of publication")
+    id: str  # Unique video identifier
+    title: str  # Video title
+    score: float  # Base popularity score (0-100)
+    published_at: int  # Unix timestamp of publication
+    tags: Tuple[str, ...] = ()  # Content tags (lists are normalized to tuples)
+    maturity_rating: str = "G"  # Content rating
+    # Tags as a mask in tag_vocab; unbound (None, 0) until with_tag_vocabulary
+    tag_bits: int = field(default=0, init=False, repr=False, compare=False)
+    tag_vocab: Optional[TagVocabulary] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    playback_url: str = field(init=False, repr=False, compare=False)  # HLS manifest
+
+    def __post_init__(self) -> None:
+        """Validate once at load time (replaces the Pydantic range check)."""
+        if not 0 <= self.score <= 100:
+            raise ValueError(f"score must be between 0 and 100, got {self.score}")
+        # Interned: watched-set probes then compare by identity on a hit
+        self.id = sys.intern(self.id)
+        if type(self.tags) is not tuple:
+            self.tags = tuple(self.tags)
+        self.playback_url = f"https://cdn.example.com/v/{self.id}.m3u8"
 
+    def with_tag_vocabulary(self, vocab: TagVocabulary) -> "VideoMetadata":
+        """Copy of this video with its tags interned into vocab (self is unchanged)."""
+        video = replace(self)
+        video.tag_bits = vocab.mask(self.tags, intern=True)
+        video.tag_vocab = vocab
+        return video
 
-class TenantRankingRules(BaseModel):
+
+def _default_boost_weights() -> Dict[str, float]:
+    return {
+        "recency": 1.0,
+        "popularity": 1.0,
+        "user_affinity": 1.0,
+    }
+
+
+@dataclass(slots=True)
+class TenantRankingRules:
     """
     Tenant-specific personalization configuration.
     Loaded from TenantConfigCache (in-memory L1).
     """
 
-    tenant_id: str = Field(..., description="Tenant identifier")
-    boost_weights: Dict[str, float] = Field(
-        default_factory=lambda: {
-            "recency": 1.0,
-            "popularity": 1.0,
-            "user_affinity": 1.0,
-        },
-        description="Weight multipliers for ranking factors",
-    )
-    filters: Dict[str, Any] = Field(
-        default_factory=dict,
-        description="Content filters (e.g., max_maturity, exclude_tags)",
-    )
-    editorial_boosts: Dict[str, int] = Field(
-        default_factory=dict,
-        description="Video ID -> fixed position (editorial override)",
-    )
+    tenant_id: str  # Tenant identifier
+    # Weight multipliers for ranking factors
+    boost_weights: Dict[str, float] = field(default_factory=_default_boost_weights)
+    # Content filters (e.g., max_maturity, exclude_tags)
+    filters: Dict[str, Any] = field(default_factory=dict)
+    # Video ID -> fixed position (editorial override)
+    editorial_boosts: Dict[str, int] = field(default_factory=dict)
+
+
+@dataclass(slots=True, frozen=True)
+class CompiledRankingRules:
+    """
+    TenantRankingRules resolved into flat fields for the ranking hot path.
+    Built once per ranking call so per-candidate code avoids dict lookups.
+    """
 
+    w_recency: float
+    w_popularity: float
+    w_affinity: float
+    exclude_tags: FrozenSet[str]  # Masked per pool vocabulary when filtering
+    blocked_ratings: FrozenSet[str]  # Ratings above filters["max_maturity"]
 
-class ScoredVideo(BaseModel):
+    @classmethod
+    def from_rules(cls, rules: TenantRankingRules) -> "CompiledRankingRules":
+        """Resolve weights and filters from tenant ranking rules."""
+        weights = rules.boost_weights
+        filters = rules.filters
+        return cls(
+            w_recency=weights.get("recency", 1.0),
+            w_popularity=weights.get("popularity", 1.0),
+            w_affinity=weights.get("user_affinity", 1.0),
+            exclude_tags=frozenset(filters.get("exclude_tags", ())),
+            # Unknown max ratings disable the filter
+            blocked_ratings=MATURITY_BLOCKED.get(
+                filters.get("max_maturity"), frozenset()
+            ),
+        )
+
+
+@dataclass(slots=True)
+class ScoredVideo:
     """Internal model for ranked video with computed score."""
 
     video: VideoMetadata
     final_score: float
-    score_breakdown: Dict[str, float] = Field(default_factory=dict)
+    score_breakdown: Optional[Dict[str, float]] = None  # Only in debug mode
 
 
 # =============================================================================
@@ -98,7 +267,12 @@ class FeedRequest(BaseModel):
 
 
 class FeedItem(BaseModel):
-    """Single item in feed response."""
+    """
+    Single item in feed response.
+    Frozen: prebuilt fallback items are shared between responses.
+    """
+
+    model_config = ConfigDict(frozen=True)
 
     id: str = Field(..., description="Video ID")
     title: str = Field(..., description="Video title")
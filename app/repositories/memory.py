@@ -3,11 +3,20 @@ In-memory repository implementations.
 Used for prototyping and testing.
 Production would replace these with Redis/Postgres implementations.
 """
+import heapq
 import time
-from typing import Dict, List, Optional
+from operator import attrgetter
+from typing import Dict, List, Optional, Tuple
 
 from app.core.cache import CacheInterface, InMemoryCache
-from app.models.schemas import TenantRankingRules, UserSignals, VideoMetadata
+from app.models.schemas import (
+    TagVocabulary,
+    TenantRankingRules,
+    UserSignals,
+    VideoMetadata,
+)
+
+_score_key = attrgetter("score")
 
 
 class InMemoryUserSignalRepository:
@@ -47,7 +56,7 @@ class InMemoryUserSignalRepository:
         signals = self._cache.get(user_hash)
         if signals is None:
             # Cold start user - return empty signals
-            return UserSignals(user_hash=user_hash)
+            return UserSignals.cold_start(user_hash)
         return signals
 
     async def save_signals(self, signals: UserSignals) -> None:
@@ -67,6 +76,12 @@ class InMemoryCandidateRepository:
     ) -> None:
         self._cache = cache or InMemoryCache[List[VideoMetadata]]()
         self._fallback_cache: Dict[str, List[VideoMetadata]] = {}
+        # Tenant -> (stored pool, limit, bounded slice): repeated requests get
+        # the same list object, so identity-keyed caches downstream can hit
+        self._bounded: Dict[
+            str, Tuple[List[VideoMetadata], int, List[VideoMetadata]]
+        ] = {}
+        self._version = 0
         self._initialize_mock_data()
 
     def _initialize_mock_data(self) -> None:
@@ -143,26 +158,56 @@ class InMemoryCandidateRepository:
             ),
         ]
 
-        self._cache.set("tenant_sports", sports_videos)
-        self._cache.set("tenant_news", news_videos)
+        self._store_candidates("tenant_sports", sports_videos)
+        self._store_candidates("tenant_news", news_videos)
+
+    def _store_candidates(self, tenant_id: str, videos: List[VideoMetadata]) -> None:
+        """Store candidates and bump the version so cached ETags are invalidated."""
+        # Fresh tag vocabulary per tenant load: masks only cover the tags this
+        # pool carries and are rebuilt (not widened) on every write. Bound
+        # copies are stored, so callers' videos can sit in several pools
+        vocab = TagVocabulary()
+        videos = [video.with_tag_vocabulary(vocab) for video in videos]
+        self._cache.set(tenant_id, videos)
 
         # Pre-compute fallback (sorted by popularity)
-        self._fallback_cache["tenant_sports"] = sorted(
-            sports_videos, key=lambda v: v.score, reverse=True
-        )[:3]
-        self._fallback_cache["tenant_news"] = sorted(
-            news_videos, key=lambda v: v.score, reverse=True
-        )[:3]
-
-    async def get_candidates(self, tenant_id: str) -> List[VideoMetadata]:
-        """Fetch all active video candidates for a tenant."""
+        self._fallback_cache[tenant_id] = heapq.nlargest(3, videos, key=_score_key)
+        self._version += 1
+
+    async def get_candidates(
+        self,
+        tenant_id: str,
+        limit: int = 200,
+    ) -> List[VideoMetadata]:
+        """Fetch up to `limit` active video candidates for a tenant."""
         candidates = self._cache.get(tenant_id)
-        return candidates if candidates else []
+        if not candidates:
+            return []
+        if len(candidates) <= limit:
+            return candidates
+        # Slice once per stored pool and limit, not per request
+        bounded = self._bounded.get(tenant_id)
+        if bounded is None or bounded[0] is not candidates or bounded[1] != limit:
+            bounded = (candidates, limit, candidates[:limit])
+            self._bounded[tenant_id] = bounded
+        return bounded[2]
 
     async def get_fallback_feed(self, tenant_id: str) -> List[VideoMetadata]:
         """Fetch pre-computed fallback feed (trending videos)."""
         return self._fallback_cache.get(tenant_id, [])
 
+    async def save_candidates(
+        self,
+        tenant_id: str,
+        videos: List[VideoMetadata],
+    ) -> None:
+        """Replace the candidate pool for a tenant."""
+        self._store_candidates(tenant_id, videos)
+
+    def get_version(self) -> int:
+        """Monotonic version of the candidate data, bumped on every write."""
+        return self._version
+
 
 class InMemoryTenantConfigRepository:
     """
@@ -6,6 +6,7 @@ from .ranking import (
     PopularityScoring,
     RankingEngine,
     RecencyScoring,
+    ScoredPool,
     ScoringStrategy,
 )
 
@@ -16,5 +17,6 @@ __all__ = [
     "PopularityScoring",
     "RankingEngine",
     "RecencyScoring",
+    "ScoredPool",
     "ScoringStrategy",
 ]
@@ -2,13 +2,23 @@
 Feature flag service implementation.
 Controls feature rollout and kill switch.
 """
-import hashlib
-from typing import Optional
+import math
+
+import xxhash
 
 from app.config import get_settings
 from app.models.interfaces import FeatureFlagService
 
 
+def rollout_bucket(tenant_id: str, user_hash: str) -> int:
+    """
+    Map a user to a stable rollout bucket in [0, 100).
+    Salted with the tenant so cohorts are independent across tenants.
+    Uses xxh3_64, which returns an integer directly.
+    """
+    return xxhash.xxh3_64_intdigest(f"{tenant_id}:{user_hash}".encode("utf-8")) % 100
+
+
 class ConfigBasedFeatureFlagService(FeatureFlagService):
     """
     Feature flag service backed by application settings.
@@ -22,7 +32,8 @@ class ConfigBasedFeatureFlagService(FeatureFlagService):
         Args:
             rollout_percentage: Percentage of users to enable (0-100)
         """
-        self._rollout_percentage = rollout_percentage
+        self._settings = get_settings()
+        self.set_rollout_percentage(rollout_percentage)
 
     def is_personalization_enabled(self, tenant_id: str, user_hash: str) -> bool:
         """
@@ -31,37 +42,24 @@ class ConfigBasedFeatureFlagService(FeatureFlagService):
         Uses consistent hashing to ensure the same user always gets
         the same result (important for A/B testing consistency).
         """
-        settings = get_settings()
-
-        # Global kill switch takes precedence
-        if self.is_kill_switch_active():
+        # Kill switch / global enable stay live reads: settings can be flipped
+        # at runtime without a reload hook, and two attribute reads are cheap
+        settings = self._settings
+        if settings.KILL_SWITCH_ACTIVE or not settings.PERSONALIZATION_ENABLED:
             return False
 
-        # Check if personalization is globally enabled
-        if not settings.PERSONALIZATION_ENABLED:
-            return False
-
-        # Percentage-based rollout
-        if self._rollout_percentage < 100.0:
-            return self._is_user_in_rollout(user_hash)
-
-        return True
+        # Percentage-based rollout (threshold resolved in set_rollout_percentage)
+        if self._full_rollout:
+            return True
+        return rollout_bucket(tenant_id, user_hash) < self._rollout_threshold
 
     def is_kill_switch_active(self) -> bool:
         """Check if global kill switch is activated."""
-        settings = get_settings()
-        return settings.KILL_SWITCH_ACTIVE
-
-    def _is_user_in_rollout(self, user_hash: str) -> bool:
-        """
-        Determine if user is in the rollout percentage.
-        Uses MD5 hash mod 100 for consistent assignment.
-        """
-        hash_bytes = hashlib.md5(user_hash.encode()).digest()
-        hash_value = int.from_bytes(hash_bytes[:4], byteorder="big")
-        bucket = hash_value % 100
-        return bucket < self._rollout_percentage
+        return self._settings.KILL_SWITCH_ACTIVE
 
     def set_rollout_percentage(self, percentage: float) -> None:
         """Update rollout percentage (for dynamic configuration)."""
         self._rollout_percentage = max(0.0, min(100.0, percentage))
+        # Integer bucket bound: bucket < pct  <=>  bucket < ceil(pct)
+        self._rollout_threshold = math.ceil(self._rollout_percentage)
+        self._full_rollout = self._rollout_threshold >= 100
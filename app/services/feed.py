@@ -3,12 +3,17 @@ Feed service - main business logic orchestrator.
 Coordinates data fetching, feature flags, circuit breaker, and ranking.
 Implements graceful degradation to fallback feed on any failure.
 """
+import asyncio
+import heapq
 import logging
 import time
-from typing import Optional, Tuple
+from operator import attrgetter
+from typing import List, Optional, Tuple
 
 from app.config.settings import get_settings
-from app.core.circuit_breaker import CircuitBreaker
+from app.core.cache import InMemoryCache
+from app.core.circuit_breaker import CircuitBreaker, CircuitState
+from app.core.exceptions import CircuitBreakerOpenError
 from app.models.interfaces import (
     CandidateRepository,
     FeatureFlagService,
@@ -20,10 +25,13 @@ from app.models.schemas import (
     FeedResponse,
     UserSignals,
 )
+from app.services.feature_flags import rollout_bucket
 from app.services.ranking import RankingEngine
 
 logger = logging.getLogger(__name__)
 
+_score_key = attrgetter("score")
+
 
 class FeedService:
     """
@@ -66,6 +74,48 @@ class FeedService:
             failure_threshold=5,
             recovery_timeout_sec=30,
         )
+        # Settings are a process-wide singleton; bind once instead of per call
+        self._settings = get_settings()
+        # Tenant -> (candidate version, prebuilt fallback items)
+        self._fallback_items = InMemoryCache[Tuple[int, List[FeedItem]]](
+            default_ttl_seconds=self._settings.FALLBACK_FEED_TTL_SEC,
+        )
+        # "tenant|limit" -> (candidate version, prebuilt kill-switch response)
+        self._kill_switch_responses = InMemoryCache[Tuple[int, FeedResponse]](
+            default_ttl_seconds=self._settings.FALLBACK_FEED_TTL_SEC,
+            max_entries=1024,
+        )
+
+    def get_feed_version(self) -> int:
+        """Version of the underlying candidate data (for cache validation)."""
+        return self._candidate_repo.get_version()
+
+    def get_response_variant(self, tenant_id: str, user_hash: str) -> str:
+        """
+        Variant of response a request is expected to get, from in-memory
+        state only (no repository reads). Used to key cached validators:
+        "kill" (kill switch), "off" (flags/rollout), "open" (circuit open,
+        circuit breaker fallback) or "on" (personalized).
+        """
+        if self._feature_flags.is_kill_switch_active():
+            return "kill"
+        if not self._is_personalization_enabled(tenant_id, user_hash):
+            return "off"
+        if self._circuit_breaker.state is CircuitState.OPEN:
+            return "open"
+        return "on"
+
+    def _is_personalization_enabled(self, tenant_id: str, user_hash: str) -> bool:
+        """Feature flags plus the settings rollout percentage."""
+        if not self._feature_flags.is_personalization_enabled(tenant_id, user_hash):
+            return False
+        # Read the setting once; skip the hash when it cannot change the
+        # outcome (100% rollout)
+        rollout_percentage = self._settings.ROLLOUT_PERCENTAGE
+        return (
+            rollout_percentage >= 100
+            or rollout_bucket(tenant_id, user_hash) < rollout_percentage
+        )
 
     async def get_feed(
             self,
@@ -86,44 +136,66 @@ class FeedService:
         Returns:
             FeedResponse with ranked items or fallback
         """
-        start_time = time.time()
-        settings = get_settings()
-
-        # Step 1: Check feature flags (FAST - in-memory)
-        personalization_enabled = self._feature_flags.is_personalization_enabled(
-            tenant_id, user_hash
+        feed_response, _ = await self.get_feed_with_variant(
+            tenant_id, user_hash, limit, cursor
         )
+        return feed_response
+
+    async def get_feed_with_variant(
+            self,
+            tenant_id: str,
+            user_hash: str,
+            limit: int = 20,
+            cursor: Optional[str] = None,
+    ) -> Tuple[FeedResponse, str]:
+        """
+        Get a feed along with the response variant actually served: one of
+        get_response_variant's values, or "fallback" when personalization
+        failed (ranking error, missing candidates, repository failure).
 
-        # Rollout Logic
-        user_hash_int = sum(ord(c) for c in user_hash)
-        if (user_hash_int % 100) >= settings.ROLLOUT_PERCENTAGE:
-            logger.info(f"User {user_hash} excluded from personalization by rollout")
-            personalization_enabled = False
+        Returns:
+            Tuple of (feed_response, variant)
+        """
+        # Kill switch: serve a prebuilt response, nothing else on the path
+        if self._feature_flags.is_kill_switch_active():
+            return await self._get_kill_switch_feed(tenant_id, limit), "kill"
 
-        if not personalization_enabled:
-            logger.info(f"Personalization disabled for tenant={tenant_id}")
-            return await self._get_fallback_feed(tenant_id, limit)
+        start_time = time.time()
+
+        # Step 1: Check feature flags and rollout (FAST - in-memory)
+        if not self._is_personalization_enabled(tenant_id, user_hash):
+            logger.info(
+                "Personalization disabled for tenant=%s, user=%s...",
+                tenant_id,
+                user_hash[:8],
+            )
+            return await self._get_fallback_feed(tenant_id, limit), "off"
 
         # Step 2: Fetch data (with graceful degradation)
         try:
-            feed_response = await self._get_personalized_feed(
+            feed_response, variant = await self._get_personalized_feed(
                 tenant_id, user_hash, limit, cursor
             )
             elapsed_ms = (time.time() - start_time) * 1000
             logger.info(
-                f"Personalized feed served: tenant={tenant_id}, "
-                f"user={user_hash[:8]}..., items={len(feed_response.items)}, "
-                f"elapsed_ms={elapsed_ms:.2f}"
+                "Personalized feed served: tenant=%s, user=%s..., items=%d, "
+                "elapsed_ms=%.2f",
+                tenant_id,
+                user_hash[:8],
+                len(feed_response.items),
+                elapsed_ms,
             )
-            return feed_response
+            return feed_response, variant
 
         except Exception as e:
             logger.error(
-                f"Personalization failed, falling back: tenant={tenant_id}, "
-                f"error={str(e)}"
+                "Personalization failed, falling back: tenant=%s, error=%s",
+                tenant_id,
+                e,
             )
             # Return degraded response check
-            return await self._get_fallback_feed(tenant_id, limit, degraded=True)
+            fallback = await self._get_fallback_feed(tenant_id, limit, degraded=True)
+            return fallback, "fallback"
 
     async def _get_personalized_feed(
             self,
@@ -131,50 +203,82 @@ class FeedService:
             user_hash: str,
             limit: int,
             cursor: Optional[str],
-    ) -> FeedResponse:
+    ) -> Tuple[FeedResponse, str]:
         """
         Execute full personalization flow.
         Wrapped by circuit breaker for resilience.
+
+        Returns:
+            Tuple of (feed_response, variant served)
         """
-        # Fetch data in parallel (in production, use asyncio.gather)
-        user_signals = await self._user_signal_repo.get_signals(user_hash)
-        candidates = await self._candidate_repo.get_candidates(tenant_id)
-        config = await self._tenant_config_repo.get_config(tenant_id)
+        # Fetch data in parallel; any failure propagates to get_feed's fallback
+        user_signals, candidates, config = await asyncio.gather(
+            self._user_signal_repo.get_signals(user_hash),
+            self._candidate_repo.get_candidates(
+                tenant_id, self._settings.MAX_RANKING_CANDIDATES
+            ),
+            self._tenant_config_repo.get_config(tenant_id),
+        )
 
         # Handle missing data gracefully
         if user_signals is None:
-            user_signals = UserSignals(user_hash=user_hash)
+            user_signals = UserSignals.cold_start(user_hash)
 
         if not candidates:
-            logger.warning(f"No candidates for tenant={tenant_id}")
-            return await self._get_fallback_feed(tenant_id, limit, degraded=True)
+            logger.warning("No candidates for tenant=%s", tenant_id)
+            fallback = await self._get_fallback_feed(tenant_id, limit, degraded=True)
+            return fallback, "fallback"
 
         if config is None:
             config = self._tenant_config_repo.get_default_config(tenant_id)
 
-        # Candidate Bounding
-        if len(candidates) > 200:
-            candidates = candidates[:200]
-
         # Execute ranking through circuit breaker
-        items, next_cursor, has_more = self._circuit_breaker.call(
-            func=lambda: self._ranking_engine.rank(
+        # Bound methods + kwargs: no per-request closures. The fallback is
+        # applied here rather than by the breaker so the variant is known
+        try:
+            items, next_cursor, has_more = self._circuit_breaker.call(
+                self._ranking_engine.rank,
                 candidates=candidates,
                 user=user_signals,
                 config=config,
                 limit=limit,
                 cursor=cursor,
-            ),
-            fallback=lambda: self._get_fallback_items_sync(candidates, limit),
-        )
+            )
+            variant = "on"
+        except Exception as e:
+            variant = "open" if isinstance(e, CircuitBreakerOpenError) else "fallback"
+            logger.warning(
+                "Ranking unavailable, using popularity fallback: tenant=%s, error=%s",
+                tenant_id,
+                e,
+            )
+            items, next_cursor, has_more = self._get_fallback_items_sync(
+                candidates, limit
+            )
 
-        return FeedResponse(
+        feed_response = FeedResponse(
             items=items,
             next_cursor=next_cursor,
             has_more=has_more,
             is_personalized=True,
             degraded=False,
         )
+        return feed_response, variant
+
+    async def _get_kill_switch_feed(self, tenant_id: str, limit: int) -> FeedResponse:
+        """
+        Fallback feed for the kill-switch path.
+        Responses are immutable once built, so one is shared per (tenant, limit).
+        """
+        key = f"{tenant_id}|{limit}"
+        version = self._candidate_repo.get_version()
+        cached = self._kill_switch_responses.get(key)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        response = await self._get_fallback_feed(tenant_id, limit)
+        self._kill_switch_responses.set(key, (version, response))
+        return response
 
     async def _get_fallback_feed(
             self,
@@ -186,20 +290,30 @@ class FeedService:
         Get non-personalized fallback feed.
         Used when personalization is disabled or fails.
         """
-        fallback_videos = await self._candidate_repo.get_fallback_feed(tenant_id)
+        # Fallback items are not personalized, so they are built once per
+        # tenant and candidate version and reused until FALLBACK_FEED_TTL_SEC
+        version = self._candidate_repo.get_version()
+        cached = self._fallback_items.get(tenant_id)
+        if cached is not None and cached[0] == version:
+            fallback_items = cached[1]
+        else:
+            fallback_videos = await self._candidate_repo.get_fallback_feed(tenant_id)
+            now = int(time.time())
+            fallback_items = [
+                FeedItem(
+                    id=video.id,
+                    title=video.title,
+                    playback_url=video.playback_url,
+                    tracking_token=f"fallback_{video.id}_{now}",
+                    debug_score=video.score,
+                )
+                for video in fallback_videos
+            ]
+            self._fallback_items.set(tenant_id, (version, fallback_items))
 
-        items = [
-            FeedItem(
-                id=video.id,
-                title=video.title,
-                playback_url=f"https://cdn.example.com/v/{video.id}.m3u8",
-                tracking_token=f"fallback_{video.id}_{int(time.time())}",
-                debug_score=video.score,
-            )
-            for video in fallback_videos[:limit]
-        ]
+        items = fallback_items[:limit]
 
-        logger.info(f"Fallback feed served: tenant={tenant_id}, items={len(items)}")
+        logger.info("Fallback feed served: tenant=%s, items=%d", tenant_id, len(items))
 
         return FeedResponse(
             items=items,
@@ -214,19 +328,16 @@ class FeedService:
             candidates: list,
             limit: int,
     ) -> Tuple[list, Optional[str], bool]:
-        """
-        Synchronous fallback for circuit breaker.
-        """
-        sorted_candidates = sorted(
-            candidates, key=lambda v: v.score, reverse=True
-        )[:limit]
+        """Synchronous popularity fallback when ranking is unavailable."""
+        sorted_candidates = heapq.nlargest(limit, candidates, key=_score_key)
+        now = int(time.time())
 
         items = [
             FeedItem(
                 id=video.id,
                 title=video.title,
-                playback_url=f"https://cdn.example.com/v/{video.id}.m3u8",
-                tracking_token=f"cb_fallback_{video.id}_{int(time.time())}",
+                playback_url=video.playback_url,
+                tracking_token=f"cb_fallback_{video.id}_{now}",
                 debug_score=video.score,
             )
             for video in sorted_candidates
@@ -3,15 +3,23 @@ Ranking engine service.
 Core personalization algorithm with filtering, scoring, and sorting.
 """
 import base64
-import json
+import binascii
+import heapq
 import logging
+import struct
 import time
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional, Tuple
+from dataclasses import dataclass
+from itertools import repeat
+from operator import add, attrgetter, is_
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
 
+from app.core.cache import CacheInterface
 from app.models.schemas import (
+    CompiledRankingRules,
     FeedItem,
     ScoredVideo,
+    TagVocabulary,
     TenantRankingRules,
     UserSignals,
     VideoMetadata,
@@ -19,6 +27,33 @@ from app.models.schemas import (
 
 logger = logging.getLogger(__name__)
 
+# Pagination cursor payload: format version byte + little-endian uint64
+# offset (9 bytes -> 12 base64 chars)
+_CURSOR = struct.Struct("<BQ")
+_CURSOR_VERSION = 1
+
+
+_tag_vocab_of = attrgetter("tag_vocab")
+
+
+def _bound_pool(candidates: List[VideoMetadata]) -> List[VideoMetadata]:
+    """
+    Candidates sharing one tag vocabulary (tag bitmasks are only comparable
+    within one). Repository pools are already bound and returned as-is;
+    unbound or mixed pools are bound as copies to a fresh vocabulary, so
+    the caller's videos are never modified.
+    """
+    if not candidates:
+        return candidates
+    vocab = candidates[0].tag_vocab
+    # map/is_ keep the per-candidate check in C
+    if vocab is not None and all(
+        map(is_, map(_tag_vocab_of, candidates), repeat(vocab))
+    ):
+        return candidates
+    vocab = TagVocabulary()
+    return [video.with_tag_vocabulary(vocab) for video in candidates]
+
 
 # =============================================================================
 # Scoring Strategy (Strategy Pattern)
@@ -28,6 +63,13 @@ logger = logging.getLogger(__name__)
 class ScoringStrategy(ABC):
     """Abstract base class for scoring strategies."""
 
+    name: str = "boost"  # Key used in the score breakdown
+    weight_key: str = ""  # Key in TenantRankingRules.boost_weights
+
+    def weight(self, config: TenantRankingRules) -> float:
+        """Resolve this strategy's tenant weight (once per batch, not per video)."""
+        return config.boost_weights.get(self.weight_key, 1.0)
+
     @abstractmethod
     def calculate_boost(
         self,
@@ -43,10 +85,29 @@ class ScoringStrategy(ABC):
         """
         pass
 
+    def calculate_boost_batch(
+        self,
+        videos: List[VideoMetadata],
+        user: UserSignals,
+        config: TenantRankingRules,
+    ) -> List[float]:
+        """
+        Calculate boost values for many videos at once.
+
+        The default delegates to calculate_boost per video; strategies
+        override it to hoist per-call work out of the per-video loop.
+
+        Returns:
+            Boost values, aligned with `videos`
+        """
+        return [self.calculate_boost(video, user, config)[0] for video in videos]
+
 
 class RecencyScoring(ScoringStrategy):
     """Boost recently published videos."""
 
+    name = "recency"
+    weight_key = "recency"
     DECAY_HOURS = 48  # Boost decays to 0 over 48 hours
 
     def calculate_boost(
@@ -55,44 +116,88 @@ class RecencyScoring(ScoringStrategy):
         user: UserSignals,
         config: TenantRankingRules,
     ) -> Tuple[float, str]:
-        now = time.time()
-        age_hours = max(0, (now - video.published_at) / 3600)
-
-        # Linear decay from weight to 0 over DECAY_HOURS
-        if age_hours >= self.DECAY_HOURS:
-            boost = 0.0
-        else:
-            decay_factor = 1.0 - (age_hours / self.DECAY_HOURS)
-            weight = config.boost_weights.get("recency", 1.0)
-            boost = weight * decay_factor
+        # Thin wrapper: the batch path is the single implementation
+        return self.calculate_boost_batch([video], user, config)[0], "recency"
 
-        return boost, "recency"
+    def calculate_boost_batch(
+        self,
+        videos: List[VideoMetadata],
+        user: UserSignals,
+        config: TenantRankingRules,
+    ) -> List[float]:
+        # Read the clock and the weight once for the whole batch;
+        # linear decay from weight to 0 over DECAY_HOURS
+        weight = self.weight(config)
+        if not weight:
+            # Disabled for this tenant: skip the per-video pass
+            return [0.0] * len(videos)
+        now = time.time()
+        decay_seconds = self.DECAY_HOURS * 3600
+        # Boost lost per second of age: one multiply per video, no division
+        slope = weight / decay_seconds
+
+        boosts = []
+        append = boosts.append
+        for video in videos:
+            age_seconds = now - video.published_at
+            if age_seconds >= decay_seconds:
+                append(0.0)
+            elif age_seconds <= 0:
+                append(weight)
+            else:
+                append(weight - age_seconds * slope)
+        return boosts
 
 
 class AffinityScoring(ScoringStrategy):
     """Boost videos matching user's category affinities."""
 
+    name = "affinity"
+    weight_key = "user_affinity"
+
     def calculate_boost(
         self,
         video: VideoMetadata,
         user: UserSignals,
         config: TenantRankingRules,
     ) -> Tuple[float, str]:
-        # Find max affinity across video tags
-        max_affinity = 0.0
-        for tag in video.tags:
-            affinity = user.affinities.get(tag, 0.0)
-            max_affinity = max(max_affinity, affinity)
-
-        weight = config.boost_weights.get("user_affinity", 1.0)
-        boost = weight * max_affinity
+        # Max affinity across video tags (batch path is the implementation)
+        return self.calculate_boost_batch([video], user, config)[0], "affinity"
 
-        return boost, "affinity"
+    def calculate_boost_batch(
+        self,
+        videos: List[VideoMetadata],
+        user: UserSignals,
+        config: TenantRankingRules,
+    ) -> List[float]:
+        weight = self.weight(config)
+        affinities = user.affinities
+        if not affinities or not weight or not videos:
+            # Cold start or disabled for this tenant: nothing to add
+            return [0.0] * len(videos)
+
+        # Bind the lookup once for the whole batch; max/map run the
+        # per-tag loop in C (affinities are in 0.0-1.0). Videos sharing no
+        # tag with the user (integer mask test) skip the lookup entirely;
+        # masks need one tag vocabulary across the batch.
+        videos = _bound_pool(videos)
+        get = affinities.get
+        affinity_mask = user.affinity_mask(videos[0].tag_vocab)
+        zeros = repeat(0.0)
+        return [
+            weight * max(map(get, video.tags, zeros))
+            if video.tag_bits & affinity_mask
+            else 0.0
+            for video in videos
+        ]
 
 
 class PopularityScoring(ScoringStrategy):
     """Apply popularity weight to base score."""
 
+    name = "popularity"
+    weight_key = "popularity"
+
     def calculate_boost(
         self,
         video: VideoMetadata,
@@ -101,8 +206,7 @@ class PopularityScoring(ScoringStrategy):
     ) -> Tuple[float, str]:
         # Popularity is applied as a multiplier, not a boost
         # This is handled differently in the engine
-        weight = config.boost_weights.get("popularity", 1.0)
-        return weight, "popularity"
+        return self.weight(config), "popularity"
 
 
 # =============================================================================
@@ -110,24 +214,88 @@ class PopularityScoring(ScoringStrategy):
 # =============================================================================
 
 
+@dataclass(slots=True)
+class ScoredPool:
+    """
+    Filtered + scored candidate pool, cached so follow-up pages skip both steps.
+    Holds the inputs it was computed from; a hit is only valid while they are
+    the same objects (rules and weights by value, since configs are mutable).
+    """
+
+    candidates: List[VideoMetadata]
+    watched_ids: Sequence[str]
+    affinities: Mapping[str, float]
+    rules: CompiledRankingRules
+    boost_weights: Dict[str, float]
+    filtered: List[VideoMetadata]
+    final_scores: List[float]
+    boost_columns: List[List[float]]
+    order: Optional[List[int]] = None  # Lazily sorted indices, best first
+
+    def matches(
+        self,
+        candidates: List[VideoMetadata],
+        user: UserSignals,
+        config: TenantRankingRules,
+        rules: CompiledRankingRules,
+    ) -> bool:
+        """Check the pool was computed from these inputs."""
+        return (
+            self.candidates is candidates
+            and self.watched_ids is user.watched_ids
+            and self.affinities is user.affinities
+            and self.rules == rules
+            and self.boost_weights == config.boost_weights
+        )
+
+    def ranked_order(self) -> List[int]:
+        """
+        Indices of filtered sorted by score (descending), computed once.
+        Same order as heapq.nlargest (stable for ties), so every page is a
+        slice of it.
+        """
+        if self.order is None:
+            self.order = sorted(
+                range(len(self.filtered)),
+                key=self.final_scores.__getitem__,
+                reverse=True,
+            )
+        return self.order
+
+
 class RankingEngine:
     """
     Main ranking engine service.
     Orchestrates filtering, scoring, and sorting of video candidates.
     """
 
-    def __init__(self, scoring_strategies: Optional[List[ScoringStrategy]] = None):
+    def __init__(
+        self,
+        scoring_strategies: Optional[List[ScoringStrategy]] = None,
+        debug_breakdown: bool = False,
+        page_cache: Optional[CacheInterface[ScoredPool]] = None,
+    ) -> None:
         """
         Initialize ranking engine with scoring strategies.
 
         Args:
             scoring_strategies: List of strategies to apply (default: all)
+            debug_breakdown: Attach per-strategy score breakdowns to ScoredVideo
+            page_cache: Cache of scored pools per user + candidate list, so
+                paging through a feed filters and scores once (default: off).
+                Its TTL bounds how long recency scores are reused.
         """
+        self._debug_breakdown = debug_breakdown
+        self._page_cache = page_cache
         self._strategies = scoring_strategies or [
             RecencyScoring(),
             AffinityScoring(),
         ]
-        self._popularity_strategy = PopularityScoring()
+        # Exactly the default pair (not subclasses): score with the fused loop
+        self._default_fast_path = [type(s) for s in self._strategies] == [
+            RecencyScoring,
+            AffinityScoring,
+        ]
 
     def rank(
         self,
@@ -151,22 +319,47 @@ class RankingEngine:
             Tuple of (feed_items, next_cursor, has_more)
         """
         offset = self._decode_cursor(cursor)
-
-        # Step 1: Filter candidates
-        filtered = self._filter_candidates(candidates, user, config)
-
-        # Step 2: Score candidates
-        scored = self._score_candidates(filtered, user, config)
-
-        # Step 3: Sort by score (descending)
-        scored.sort(key=lambda x: x.final_score, reverse=True)
+        # Resolved per call (TenantRankingRules is mutable), not per candidate
+        rules = CompiledRankingRules.from_rules(config)
+
+        # Steps 1-2: Filter and score candidates (plain floats, no per-video
+        # objects yet); reused from the page cache for follow-up pages
+        pool = self._scored_pool(candidates, user, config, rules)
+        filtered = pool.filtered
+        final_scores = pool.final_scores
+        boost_columns = pool.boost_columns
+
+        # Step 3: Select top candidates by score (descending). Without
+        # editorial pins, positions before the offset are final, so earlier
+        # pages are dropped before materializing
+        pinned = bool(config.editorial_boosts)
+        if pinned:
+            top_indices = self._select_top(
+                filtered, final_scores, offset + limit, config
+            )
+        elif self._page_cache is not None and (offset or pool.order is not None):
+            # Later pages of a cached pool are a slice of its full order;
+            # first pages keep the partial top-k selection
+            top_indices = pool.ranked_order()[offset : offset + limit]
+        else:
+            top_indices = self._select_top(
+                filtered, final_scores, offset + limit, config
+            )[offset:]
+
+        # Only the selected videos are materialized as ScoredVideo
+        if self._debug_breakdown:
+            ranked = self._build_scored(
+                top_indices, filtered, final_scores, boost_columns, rules
+            )
+        else:
+            ranked = [ScoredVideo(filtered[i], final_scores[i]) for i in top_indices]
 
         # Step 4: Apply editorial overrides
-        scored = self._apply_editorial_boosts(scored, config)
+        ranked = self._apply_editorial_boosts(ranked, config)
 
         # Step 5: Paginate
-        page_items = scored[offset : offset + limit]
-        has_more = len(scored) > offset + limit
+        page_items = ranked[offset : offset + limit] if pinned else ranked
+        has_more = len(filtered) > offset + limit
 
         # Step 6: Transform to FeedItem
         feed_items = self._to_feed_items(page_items)
@@ -177,85 +370,240 @@ class RankingEngine:
             next_cursor = self._encode_cursor(offset + limit)
 
         logger.debug(
-            f"Ranked {len(candidates)} candidates -> {len(filtered)} filtered -> "
-            f"returning {len(feed_items)} items"
+            "Ranked %d candidates -> %d filtered -> returning %d items",
+            len(candidates),
+            len(filtered),
+            len(feed_items),
         )
 
         return feed_items, next_cursor, has_more
 
-    def _filter_candidates(
+    def _scored_pool(
         self,
         candidates: List[VideoMetadata],
         user: UserSignals,
         config: TenantRankingRules,
-    ) -> List[VideoMetadata]:
-        """Apply filters to remove ineligible candidates."""
-        watched_ids = set(user.watched_ids)
-        exclude_tags = set(config.filters.get("exclude_tags", []))
-        max_maturity = config.filters.get("max_maturity")
-
-        filtered = []
-        for video in candidates:
-            # Filter: Already watched
-            if video.id in watched_ids:
-                continue
-
-            # Filter: Excluded tags
-            if any(tag in exclude_tags for tag in video.tags):
-                continue
+        rules: CompiledRankingRules,
+    ) -> ScoredPool:
+        """Filter and score candidates, reusing a cached pool when valid."""
+        cache = self._page_cache
+        if cache is not None:
+            key = self._pool_key(user, candidates)
+            pool = cache.get(key)
+            if pool is not None and pool.matches(candidates, user, config, rules):
+                return pool
+
+        filtered = self._filter_candidates(_bound_pool(candidates), user, rules)
+        final_scores, boost_columns = self._score_candidates(
+            filtered, user, config, rules, self._debug_breakdown
+        )
+        pool = ScoredPool(
+            candidates,
+            user.watched_ids,
+            user.affinities,
+            rules,
+            dict(config.boost_weights),
+            filtered,
+            final_scores,
+            boost_columns,
+        )
+        if cache is not None:
+            cache.set(key, pool)
+        return pool
 
-            # Filter: Maturity rating (simplified)
-            if max_maturity and not self._is_maturity_allowed(
-                video.maturity_rating, max_maturity
-            ):
-                continue
+    @staticmethod
+    def _pool_key(user: UserSignals, candidates: List[VideoMetadata]) -> str:
+        """Page cache key; hits are validated with ScoredPool.matches."""
+        return f"{user.user_hash}|{id(candidates)}"
 
-            filtered.append(video)
+    def _filter_candidates(
+        self,
+        candidates: List[VideoMetadata],
+        user: UserSignals,
+        rules: CompiledRankingRules,
+    ) -> List[VideoMetadata]:
+        """
+        Apply filters to remove ineligible candidates.
 
-        return filtered
+        Specialized on which filters are active (resolved once per call):
+        tenants without content filters only pay the watched-set probe.
+        Candidates must share one tag vocabulary (see _bound_pool).
+        """
+        watched_ids = user.watched_set
+        # Excluded tags as a mask in the pool's vocabulary (tags no candidate
+        # carries drop out)
+        exclude_tags = rules.exclude_tags
+        exclude_mask = (
+            candidates[0].tag_vocab.mask(exclude_tags)
+            if exclude_tags and candidates
+            else 0
+        )
+        blocked_ratings = rules.blocked_ratings
+
+        if not exclude_mask and not blocked_ratings:
+            if not watched_ids:
+                return list(candidates)
+            return [video for video in candidates if video.id not in watched_ids]
+
+        return [
+            video
+            for video in candidates
+            if not (
+                # Already watched
+                video.id in watched_ids
+                # Excluded tags
+                or video.tag_bits & exclude_mask
+                # Maturity rating (unknown ratings are allowed)
+                or video.maturity_rating in blocked_ratings
+            )
+        ]
 
     def _score_candidates(
         self,
         candidates: List[VideoMetadata],
         user: UserSignals,
         config: TenantRankingRules,
-    ) -> List[ScoredVideo]:
-        """Calculate scores for all candidates."""
-        scored = []
-        popularity_weight, _ = self._popularity_strategy.calculate_boost(
-            candidates[0] if candidates else VideoMetadata(
-                id="", title="", score=0, published_at=0
-            ),
-            user,
-            config,
+        rules: CompiledRankingRules,
+        with_columns: bool = True,
+    ) -> Tuple[List[float], List[List[float]]]:
+        """
+        Calculate final scores for all candidates.
+
+        Returns (final_scores, boost_columns), both aligned with candidates;
+        boost_columns holds one column per strategy for the score breakdown
+        (the fused default path leaves it empty unless with_columns is set).
+        """
+        if self._default_fast_path:
+            return self._score_default_fast(candidates, user, rules, with_columns)
+        popularity_weight = rules.w_popularity
+
+        # Each strategy scores the whole batch, then boosts are summed per video
+        boost_columns = [
+            strategy.calculate_boost_batch(candidates, user, config)
+            for strategy in self._strategies
+        ]
+        # Column-wise fold: map(add) runs in C with no per-video tuples
+        total_boosts = [0.0] * len(candidates)
+        for column in boost_columns:
+            total_boosts = list(map(add, total_boosts, column))
+
+        # Final score: Base (popularity adjusted) * (1 + TotalBoost)
+        final_scores = [
+            video.score * popularity_weight * (1.0 + total_boost)
+            for video, total_boost in zip(candidates, total_boosts)
+        ]
+        return final_scores, boost_columns
+
+    def _score_default_fast(
+        self,
+        candidates: List[VideoMetadata],
+        user: UserSignals,
+        rules: CompiledRankingRules,
+        with_columns: bool = True,
+    ) -> Tuple[List[float], List[List[float]]]:
+        """
+        Fused recency + affinity scoring for the default strategy set.
+        Same math as RecencyScoring/AffinityScoring batch paths, in one loop
+        with all lookups bound to locals. Fields are read straight off the
+        slotted VideoMetadata: copying the pool into per-field columns first
+        (SoA) is slower in pure Python than the slot loads it would replace.
+        """
+        now = time.time()
+        decay_seconds = RecencyScoring.DECAY_HOURS * 3600
+        w_recency = rules.w_recency
+        recency_slope = w_recency / decay_seconds
+        w_affinity = rules.w_affinity
+        popularity_weight = rules.w_popularity
+        affinities = user.affinities
+        get = affinities.get if affinities and w_affinity else None
+        # Videos sharing no tag with the user's affinities skip the lookup
+        affinity_mask = (
+            user.affinity_mask(candidates[0].tag_vocab)
+            if get is not None and candidates
+            else 0
         )
+        zeros = repeat(0.0)
 
+        recency_col: List[float] = []
+        affinity_col: List[float] = []
+        final_scores: List[float] = []
         for video in candidates:
-            # Base score (popularity adjusted)
-            base_score = video.score * popularity_weight
+            age_seconds = now - video.published_at
+            if not w_recency or age_seconds >= decay_seconds:
+                recency = 0.0
+            elif age_seconds <= 0:
+                recency = w_recency
+            else:
+                recency = w_recency - age_seconds * recency_slope
+
+            if video.tag_bits & affinity_mask:
+                affinity = w_affinity * max(map(get, video.tags, zeros))
+            else:
+                affinity = 0.0
 
-            # Calculate boosts from strategies
-            total_boost = 0.0
-            breakdown: Dict[str, float] = {"base": base_score}
+            if with_columns:
+                recency_col.append(recency)
+                affinity_col.append(affinity)
+            final_scores.append(
+                video.score * popularity_weight * (1.0 + (recency + affinity))
+            )
+        return final_scores, [recency_col, affinity_col] if with_columns else []
 
-            for strategy in self._strategies:
-                boost, name = strategy.calculate_boost(video, user, config)
-                total_boost += boost
-                breakdown[name] = boost
+    @staticmethod
+    def _select_top(
+        candidates: List[VideoMetadata],
+        final_scores: List[float],
+        count: int,
+        config: TenantRankingRules,
+    ) -> List[int]:
+        """
+        Return indices of the highest scoring candidates in descending order.
 
-            # Final score: Base * (1 + TotalBoost)
-            final_score = base_score * (1.0 + total_boost)
-            breakdown["total_boost"] = total_boost
-            breakdown["final"] = final_score
+        Only the first `count` positions can be served, so a bounded heap
+        selection (O(N log K)) replaces sorting the full list. Editorially
+        boosted videos are pinned regardless of score, so they are always
+        kept (after the selected videos) for _apply_editorial_boosts.
+        """
+        score_of = final_scores.__getitem__
+        indices = range(len(candidates))
+        boost_ids = config.editorial_boosts
+        if not boost_ids:
+            return heapq.nlargest(count, indices, key=score_of)
+
+        # Single partition pass instead of scanning the candidates twice
+        pinned: List[int] = []
+        rest: List[int] = []
+        for i in indices:
+            (pinned if candidates[i].id in boost_ids else rest).append(i)
+        return heapq.nlargest(count, rest, key=score_of) + pinned
+
+    def _build_scored(
+        self,
+        indices: List[int],
+        candidates: List[VideoMetadata],
+        final_scores: List[float],
+        boost_columns: List[List[float]],
+        rules: CompiledRankingRules,
+    ) -> List[ScoredVideo]:
+        """Materialize ScoredVideo (with score breakdown) for selected candidates."""
+        names = [strategy.name for strategy in self._strategies]
+        popularity_weight = rules.w_popularity
 
+        scored = []
+        for i in indices:
+            video = candidates[i]
+            boosts = [column[i] for column in boost_columns]
+            breakdown: Dict[str, float] = {"base": video.score * popularity_weight}
+            breakdown.update(zip(names, boosts))
+            breakdown["total_boost"] = sum(boosts)
+            breakdown["final"] = final_scores[i]
             scored.append(
                 ScoredVideo(
                     video=video,
-                    final_score=final_score,
+                    final_score=final_scores[i],
                     score_breakdown=breakdown,
                 )
             )
-
         return scored
 
     def _apply_editorial_boosts(
@@ -264,66 +612,71 @@ class RankingEngine:
         config: TenantRankingRules,
     ) -> List[ScoredVideo]:
         """Apply editorial position overrides."""
-        if not config.editorial_boosts:
+        boost_ids = config.editorial_boosts
+        if not boost_ids:
+            return scored
+
+        # Most boosts target videos outside this pool: nothing to move
+        matching = [i for i, item in enumerate(scored) if item.video.id in boost_ids]
+        if not matching:
             return scored
 
         # Extract boosted items and remove from main list
         boosted_items: Dict[int, ScoredVideo] = {}
-        remaining = []
-
-        for item in scored:
-            if item.video.id in config.editorial_boosts:
-                position = config.editorial_boosts[item.video.id]
-                boosted_items[position] = item
-            else:
-                remaining.append(item)
-
-        # Insert boosted items at specified positions
-        result = remaining[:]
+        for i in matching:
+            item = scored[i]
+            boosted_items[boost_ids[item.video.id]] = item
+        # Splice out from the end so earlier indices stay valid
+        remaining = scored[:]
+        for i in reversed(matching):
+            del remaining[i]
+
+        # Single merge pass: fill unboosted items up to each boosted position
+        # (positions past the end append, as with list.insert)
+        result: List[ScoredVideo] = []
+        taken = 0
         for position, item in sorted(boosted_items.items()):
-            insert_idx = min(position, len(result))
-            result.insert(insert_idx, item)
+            fill = position - len(result)
+            if fill > 0:
+                result.extend(remaining[taken : taken + fill])
+                taken += fill
+            result.append(item)
+        result.extend(remaining[taken:])
 
         return result
 
     def _to_feed_items(self, scored: List[ScoredVideo]) -> List[FeedItem]:
         """Transform scored videos to feed items."""
-        items = []
-        for sv in scored:
-            item = FeedItem(
+        # One clock read per response; tokens share the timestamp suffix
+        token_suffix = f"_{int(time.time())}"
+        return [
+            FeedItem(
                 id=sv.video.id,
                 title=sv.video.title,
-                playback_url=f"https://cdn.example.com/v/{sv.video.id}.m3u8",
-                tracking_token=f"tok_{sv.video.id}_{int(time.time())}",
+                playback_url=sv.video.playback_url,
+                tracking_token="tok_" + sv.video.id + token_suffix,
                 debug_score=round(sv.final_score, 2),
             )
-            items.append(item)
-        return items
+            for sv in scored
+        ]
 
     def _decode_cursor(self, cursor: Optional[str]) -> int:
         """Decode pagination cursor to offset."""
         if not cursor:
             return 0
         try:
-            decoded = base64.b64decode(cursor).decode("utf-8")
-            data = json.loads(decoded)
-            return data.get("offset", 0)
-        except Exception:
-            logger.warning(f"Invalid cursor: {cursor}")
+            # Restore the stripped base64 padding
+            raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            version, offset = _CURSOR.unpack(raw)
+        except (binascii.Error, struct.error, ValueError):
+            logger.warning("Invalid cursor: %s", cursor)
+            return 0
+        if version != _CURSOR_VERSION:
+            logger.warning("Unsupported cursor version %d: %s", version, cursor)
             return 0
+        return offset
 
     def _encode_cursor(self, offset: int) -> str:
-        """Encode offset to pagination cursor."""
-        data = {"offset": offset}
-        return base64.b64encode(json.dumps(data).encode("utf-8")).decode("utf-8")
-
-    @staticmethod
-    def _is_maturity_allowed(video_rating: str, max_rating: str) -> bool:
-        """Check if video rating is within allowed limit."""
-        ratings = ["G", "PG", "PG-13", "R", "NC-17"]
-        try:
-            video_idx = ratings.index(video_rating)
-            max_idx = ratings.index(max_rating)
-            return video_idx <= max_idx
-        except ValueError:
-            return True  # Unknown ratings are allowed
+        """Encode offset to pagination cursor (opaque versioned packed uint64)."""
+        raw = _CURSOR.pack(_CURSOR_VERSION, offset)
+        return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
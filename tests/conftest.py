@@ -1,8 +1,13 @@
 """
 Pytest configuration and fixtures.
+
+Integration tests use an httpx.AsyncClient over ASGITransport: requests run
+on the test's own event loop (no TestClient worker thread), so tests are
+`async def` + `@pytest.mark.asyncio` and await each call.
 """
+import httpx
 import pytest
-from fastapi.testclient import TestClient
+import pytest_asyncio
 
 from app.api.dependencies import (
     get_candidate_repository,
@@ -39,15 +44,16 @@ def mock_tenant_config_repo():
     return repo
 
 
-@pytest.fixture
-def test_client(
+@pytest_asyncio.fixture
+async def test_client(
     mock_user_signal_repo,
     mock_candidate_repo,
     mock_tenant_config_repo,
 ):
     """
-    TestClient fixture with dependency overrides.
-    Uses in-memory repositories for isolation.
+    In-process async client fixture with dependency overrides.
+    Uses in-memory repositories for isolation. ASGITransport does not send
+    lifespan events, so the app lifespan is entered explicitly.
     """
     app.dependency_overrides[get_user_signal_repository] = lambda: mock_user_signal_repo
     app.dependency_overrides[get_candidate_repository] = lambda: mock_candidate_repo
@@ -55,8 +61,12 @@ def test_client(
         get_tenant_config_repository
     ] = lambda: mock_tenant_config_repo
 
-    with TestClient(app) as client:
-        yield client
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://test"
+        ) as client:
+            yield client
 
     app.dependency_overrides.clear()
 
@@ -1,15 +1,17 @@
 """
 Integration tests for Feed API.
 """
-from fastapi.testclient import TestClient
+import pytest
+from httpx import AsyncClient
 
 from app.config import get_settings
 
 
 class TestFeedAPI:
-    def test_get_feed_personalized(self, test_client: TestClient):
+    @pytest.mark.asyncio
+    async def test_get_feed_personalized(self, test_client: AsyncClient):
         """Test happy path personalized feed."""
-        response = test_client.get(
+        response = await test_client.get(
             "/v1/feed",
             params={"user_hash": "user_sporty", "limit": 5},
             headers={"X-Tenant-ID": "tenant_sports"},
@@ -24,9 +26,10 @@ class TestFeedAPI:
         assert "max-age=30" in response.headers["Cache-Control"]
         assert "ETag" in response.headers
 
-    def test_get_feed_cold_start(self, test_client: TestClient):
+    @pytest.mark.asyncio
+    async def test_get_feed_cold_start(self, test_client: AsyncClient):
         """Test feed for unknown user (cold start)."""
-        response = test_client.get(
+        response = await test_client.get(
             "/v1/feed",
             params={"user_hash": "user_unknown_123", "limit": 5},
             headers={"X-Tenant-ID": "tenant_sports"},
@@ -39,9 +42,10 @@ class TestFeedAPI:
         # unless fallback triggered
         assert data["is_personalized"] is True
 
-    def test_get_feed_fallback_tenant_not_found(self, test_client: TestClient):
+    @pytest.mark.asyncio
+    async def test_get_feed_fallback_tenant_not_found(self, test_client: AsyncClient):
         """Test fallback when tenant config missing."""
-        response = test_client.get(
+        response = await test_client.get(
             "/v1/feed",
             params={"user_hash": "user_sporty"},
             headers={"X-Tenant-ID": "tenant_unknown"},
@@ -54,14 +58,15 @@ class TestFeedAPI:
         assert data["is_personalized"] is False
         assert data["degraded"] is True
 
-    def test_kill_switch(self, test_client: TestClient):
+    @pytest.mark.asyncio
+    async def test_kill_switch(self, test_client: AsyncClient):
         """Test global kill switch via settings."""
         settings = get_settings()
         original_value = settings.KILL_SWITCH_ACTIVE
         settings.KILL_SWITCH_ACTIVE = True
 
         try:
-            response = test_client.get(
+            response = await test_client.get(
                 "/v1/feed",
                 params={"user_hash": "user_sporty"},
                 headers={"X-Tenant-ID": "tenant_sports"},
@@ -72,12 +77,21 @@ class TestFeedAPI:
             assert data["is_personalized"] is False
             assert data["degraded"] is False  # Kill switch is intentional, not an error
 
+            # Repeat requests are served from the prebuilt response
+            repeat = await test_client.get(
+                "/v1/feed",
+                params={"user_hash": "user_newsy"},
+                headers={"X-Tenant-ID": "tenant_sports"},
+            )
+            assert repeat.json() == data
+
         finally:
             settings.KILL_SWITCH_ACTIVE = original_value
 
-    def test_circuit_breaker_status(self, test_client: TestClient):
+    @pytest.mark.asyncio
+    async def test_circuit_breaker_status(self, test_client: AsyncClient):
         """Test health endpoint shows circuit status."""
-        response = test_client.get("/health/ready")
+        response = await test_client.get("/health/ready")
         assert response.status_code == 200
         data = response.json()
         assert data["circuit_breaker"]["state"] == "closed"
@@ -1,11 +1,16 @@
+from unittest.mock import AsyncMock, patch
+
 import pytest
-from fastapi.testclient import TestClient
+from httpx import AsyncClient
 
+from app.api.dependencies import get_user_signal_repository
 from app.config.settings import get_settings
+from app.models.schemas import UserSignals
+from app.services.feed import FeedService
 
 
 @pytest.mark.asyncio
-async def test_cache_headers_personalized(test_client: TestClient):
+async def test_cache_headers_personalized(test_client: AsyncClient):
     """
     Test Cache-Control and ETag for personalized content.
     """
@@ -15,7 +20,7 @@ async def test_cache_headers_personalized(test_client: TestClient):
     settings.ROLLOUT_PERCENTAGE = 100
 
     try:
-        response = test_client.get(
+        response = await test_client.get(
             "/v1/feed",
             params={"user_hash": "user_normal", "limit": 5},
             headers={"X-Tenant-ID": "tenant_sports"}
@@ -33,19 +38,23 @@ async def test_cache_headers_personalized(test_client: TestClient):
         etag = headers["ETag"]
 
         # Test Conditional Request (304)
-        resp_304 = test_client.get(
+        resp_304 = await test_client.get(
             "/v1/feed",
             params={"user_hash": "user_normal", "limit": 5},
             headers={"X-Tenant-ID": "tenant_sports", "If-None-Match": etag}
         )
         assert resp_304.status_code == 304
+        # Validators must survive the 304 so the client keeps revalidating
+        assert resp_304.headers["ETag"] == etag
+        assert "private" in resp_304.headers["Cache-Control"]
+        assert "X-User-Hash" in resp_304.headers["Vary"]
 
     finally:
         get_settings.ROLLOUT_PERCENTAGE = original_percentage
 
 
 @pytest.mark.asyncio
-async def test_cache_headers_fallback(test_client: TestClient):
+async def test_cache_headers_fallback(test_client: AsyncClient):
     """
     Test Cache-Control for fallback/degraded content.
     We force fallback via feature flag or rollout.
@@ -56,7 +65,7 @@ async def test_cache_headers_fallback(test_client: TestClient):
     settings.ROLLOUT_PERCENTAGE = 0
 
     try:
-        response = test_client.get(
+        response = await test_client.get(
             "/v1/feed",
             params={"user_hash": "user_fallback", "limit": 5},
             headers={"X-Tenant-ID": "tenant_sports"}
@@ -73,3 +82,125 @@ async def test_cache_headers_fallback(test_client: TestClient):
 
     finally:
         settings.ROLLOUT_PERCENTAGE = original_percentage
+
+
+@pytest.mark.asyncio
+async def test_etag_stable_across_repeated_requests(test_client: AsyncClient):
+    """
+    Repeated identical requests within the TTL share the same ETag.
+    """
+    params = {"user_hash": "user_repeat", "limit": 5}
+    headers = {"X-Tenant-ID": "tenant_sports"}
+
+    first = await test_client.get("/v1/feed", params=params, headers=headers)
+    second = await test_client.get("/v1/feed", params=params, headers=headers)
+
+    assert first.status_code == 200
+    assert second.status_code == 200
+    assert first.headers["ETag"] == second.headers["ETag"]
+
+
+@pytest.mark.asyncio
+async def test_conditional_request_skips_feed_service(test_client: AsyncClient):
+    """
+    A matching If-None-Match is answered before the feed service runs.
+    """
+    params = {"user_hash": "user_conditional", "limit": 5}
+    headers = {"X-Tenant-ID": "tenant_sports"}
+
+    response = await test_client.get("/v1/feed", params=params, headers=headers)
+    etag = response.headers["ETag"]
+
+    with patch.object(
+        FeedService, "get_feed_with_variant", new_callable=AsyncMock
+    ) as mock_get_feed:
+        resp_304 = await test_client.get(
+            "/v1/feed",
+            params=params,
+            headers={**headers, "If-None-Match": etag},
+        )
+
+    assert resp_304.status_code == 304
+    mock_get_feed.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_conditional_request_weak_comparison(test_client: AsyncClient):
+    """
+    If-None-Match matches with or without the W/ prefix and inside a list.
+    """
+    params = {"user_hash": "user_weak", "limit": 5}
+    headers = {"X-Tenant-ID": "tenant_sports"}
+
+    response = await test_client.get("/v1/feed", params=params, headers=headers)
+    etag = response.headers["ETag"]
+    strong = etag[2:] if etag.startswith("W/") else etag
+
+    for if_none_match in (strong, f'"other", {etag}', "*"):
+        resp = await test_client.get(
+            "/v1/feed",
+            params=params,
+            headers={**headers, "If-None-Match": if_none_match},
+        )
+        assert resp.status_code == 304
+
+
+@pytest.mark.asyncio
+async def test_kill_switch_flip_invalidates_validator(test_client: AsyncClient):
+    """
+    A validator cached for the personalized feed never matches the fallback
+    served after the kill switch flips; its ETag describes the new items.
+    """
+    settings = get_settings()
+    params = {"user_hash": "user_sporty", "limit": 5}
+    headers = {"X-Tenant-ID": "tenant_sports"}
+
+    personalized = await test_client.get("/v1/feed", params=params, headers=headers)
+    etag = personalized.headers["ETag"]
+
+    original_value = settings.KILL_SWITCH_ACTIVE
+    settings.KILL_SWITCH_ACTIVE = True
+    try:
+        response = await test_client.get(
+            "/v1/feed",
+            params=params,
+            headers={**headers, "If-None-Match": etag},
+        )
+    finally:
+        settings.KILL_SWITCH_ACTIVE = original_value
+
+    assert response.status_code == 200
+    assert response.json()["is_personalized"] is False
+    assert response.headers["X-Personalized"] == "false"
+    assert response.headers["ETag"] != etag
+
+
+@pytest.mark.asyncio
+async def test_empty_feed_drops_cached_validator(test_client: AsyncClient):
+    """
+    Once the feed for a request is served empty, the validator cached for
+    its previous items no longer answers 304.
+    """
+    params = {"user_hash": "user_watched_all", "limit": 5}
+    headers = {"X-Tenant-ID": "tenant_sports"}
+
+    response = await test_client.get("/v1/feed", params=params, headers=headers)
+    etag = response.headers["ETag"]
+
+    # Watch history changes do not bump the candidate version
+    await get_user_signal_repository().save_signals(
+        UserSignals(
+            user_hash="user_watched_all",
+            watched_ids=[item["id"] for item in response.json()["items"]],
+        )
+    )
+    emptied = await test_client.get("/v1/feed", params=params, headers=headers)
+    conditional = await test_client.get(
+        "/v1/feed",
+        params=params,
+        headers={**headers, "If-None-Match": etag},
+    )
+
+    assert emptied.json()["items"] == []
+    assert "ETag" not in emptied.headers
+    assert conditional.status_code == 200
@@ -1,11 +1,12 @@
 import pytest
-from fastapi.testclient import TestClient
+from httpx import AsyncClient
 
 from app.config.settings import get_settings
+from app.services.feature_flags import rollout_bucket
 
 
 @pytest.mark.asyncio
-async def test_rollout_logic(test_client: TestClient):
+async def test_rollout_logic(test_client: AsyncClient):
     """
     Test that users are included/excluded based on rollout percentage.
     """
@@ -16,19 +17,15 @@ async def test_rollout_logic(test_client: TestClient):
 
     try:
         # 2. Find a user hash that should be IN (< 50)
-        # Hash logic: sum(ord(c)) % 100
-        user_in = "user_in"
-        # Ensure it's < 50
-        while (sum(ord(c) for c in user_in) % 100) >= 50:
-            user_in += "a"
+        # Bucket logic: xxh3_64(f"{tenant}:{user_hash}") % 100
+        candidates = [f"user_{i}" for i in range(100)]
+        user_in = next(u for u in candidates if rollout_bucket("tenant_sports", u) < 50)
 
         # 3. Find a user hash that should be OUT (>= 50)
-        user_out = "user_out"
-        while (sum(ord(c) for c in user_out) % 100) < 50:
-            user_out += "a"
+        user_out = next(u for u in candidates if rollout_bucket("tenant_sports", u) >= 50)
 
         # 4. Request for IN user -> Personalized
-        resp_in = test_client.get(
+        resp_in = await test_client.get(
             "/v1/feed",
             params={"user_hash": user_in},
             headers={"X-Tenant-ID": "tenant_sports"}
@@ -39,7 +36,7 @@ async def test_rollout_logic(test_client: TestClient):
         assert data_in.get("degraded", False) is False
 
         # 5. Request for OUT user -> Fallback (Not Personalized)
-        resp_out = test_client.get(
+        resp_out = await test_client.get(
             "/v1/feed",
             params={"user_hash": user_out},
             headers={"X-Tenant-ID": "tenant_sports"}
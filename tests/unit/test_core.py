@@ -66,6 +66,17 @@ class TestCircuitBreaker:
         res2 = cb.call(lambda: "success", fallback=mock_fallback)
         assert res2 == "fallback"
 
+    def test_call_forwards_arguments(self):
+        cb = CircuitBreaker("test", failure_threshold=1)
+        mock_func = MagicMock(side_effect=Exception("Error"))
+        mock_fallback = MagicMock(return_value="fallback")
+
+        res = cb.call(mock_func, 1, limit=5, fallback=mock_fallback)
+
+        assert res == "fallback"
+        mock_func.assert_called_once_with(1, limit=5)
+        mock_fallback.assert_called_once_with(1, limit=5)
+
     def test_recovery_half_open(self):
         cb = CircuitBreaker("test", failure_threshold=1, recovery_timeout_sec=0.1)
         # Open it
@@ -187,6 +198,24 @@ class TestInMemoryCache:
         assert val2 == "computed"
         factory.assert_called_once() # count stays 1
 
+    def test_get_or_set_caches_none(self):
+        cache = InMemoryCache()
+        factory = MagicMock(return_value=None)
+
+        assert cache.get_or_set("key", factory) is None
+        assert cache.get_or_set("key", factory) is None
+        factory.assert_called_once()
+
+    def test_max_entries_evicts_oldest(self):
+        cache = InMemoryCache(max_entries=InMemoryCache.NUM_SHARDS)
+
+        for i in range(InMemoryCache.NUM_SHARDS * 4):
+            cache.set(f"k{i}", i)
+
+        assert cache.size() <= InMemoryCache.NUM_SHARDS
+        # The most recent write is always retained
+        assert cache.get(f"k{InMemoryCache.NUM_SHARDS * 4 - 1}") is not None
+
     def test_cleanup_expired(self):
         cache = InMemoryCache()
         cache.set("k1", "v1", ttl_seconds=0.01)
@@ -200,3 +229,35 @@ class TestInMemoryCache:
         assert cache.get("k1") is None
         assert cache.get("k2") == "v2"
 
+    def test_cleanup_skips_overwritten_entries(self):
+        cache = InMemoryCache()
+        cache.set("k1", "old", ttl_seconds=0.01)
+        # Overwrite with a longer TTL; the stale heap entry must not evict it
+        cache.set("k1", "new", ttl_seconds=10)
+
+        time.sleep(0.05)
+
+        assert cache.cleanup_expired() == 0
+        assert cache.get("k1") == "new"
+
+    def test_heap_rebuilt_after_overwrites(self):
+        cache = InMemoryCache()
+        for i in range(500):
+            cache.set("k1", i, ttl_seconds=10)
+
+        # Stale pairs from overwrites are compacted away, live entry kept
+        _, _, heap = cache._shard("k1")
+        assert len(heap) <= 2 * 1 + 64 + 1
+        assert cache.get("k1") == 499
+
+    def test_expired_read_keeps_concurrent_write(self):
+        cache = InMemoryCache()
+        cache.set("k1", "old", ttl_seconds=10)
+        store, _, _ = cache._shard("k1")
+        stale = store["k1"]
+        # A set lands between a read seeing the expired entry and dropping it
+        cache.set("k1", "new", ttl_seconds=10)
+
+        cache._drop_expired("k1", stale)
+
+        assert cache.get("k1") == "new"
@@ -0,0 +1,70 @@
+"""
+Unit tests for FeedService.
+"""
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.config import get_settings
+from app.core.cache import InMemoryCache
+from app.core.circuit_breaker import CircuitBreaker
+from app.repositories.memory import (
+    InMemoryCandidateRepository,
+    InMemoryTenantConfigRepository,
+    InMemoryUserSignalRepository,
+)
+from app.services.feature_flags import ConfigBasedFeatureFlagService
+from app.services.feed import FeedService
+from app.services.ranking import RankingEngine
+
+
+def _service(engine: RankingEngine, **settings: object) -> FeedService:
+    """FeedService over the mock repositories, with everyone rolled out."""
+    service = FeedService(
+        user_signal_repo=InMemoryUserSignalRepository(),
+        candidate_repo=InMemoryCandidateRepository(),
+        tenant_config_repo=InMemoryTenantConfigRepository(),
+        feature_flag_service=ConfigBasedFeatureFlagService(),
+        ranking_engine=engine,
+        circuit_breaker=CircuitBreaker("test", failure_threshold=1),
+    )
+    service._settings = get_settings().model_copy(
+        update={"ROLLOUT_PERCENTAGE": 100, **settings}
+    )
+    return service
+
+
+class TestFeedService:
+    @pytest.mark.asyncio
+    async def test_page_cache_hits_for_bounded_pool(self):
+        """Follow-up pages reuse the scored pool when the pool is truncated."""
+        engine = RankingEngine(page_cache=InMemoryCache())
+        engine._filter_candidates = MagicMock(wraps=engine._filter_candidates)
+        # tenant_sports stores 5 videos: the bound forces a sliced pool
+        service = _service(engine, MAX_RANKING_CANDIDATES=4)
+
+        page1 = await service.get_feed("tenant_sports", "user_new", limit=2)
+        page2 = await service.get_feed(
+            "tenant_sports", "user_new", limit=2, cursor=page1.next_cursor
+        )
+
+        assert page1.is_personalized and page2.is_personalized
+        assert engine._filter_candidates.call_count == 1
+        assert not {i.id for i in page1.items} & {i.id for i in page2.items}
+
+    @pytest.mark.asyncio
+    async def test_reports_variant_served(self):
+        """Breaker fallbacks are reported as such, not as personalized."""
+        engine = RankingEngine()
+        engine.rank = MagicMock(side_effect=RuntimeError("ranking down"))
+        service = _service(engine)
+
+        _, failed = await service.get_feed_with_variant("tenant_sports", "user_new")
+        predicted = service.get_response_variant("tenant_sports", "user_new")
+        response, served = await service.get_feed_with_variant(
+            "tenant_sports", "user_new"
+        )
+
+        assert failed == "fallback"
+        assert served == predicted == "open"
+        assert response.items
@@ -0,0 +1,125 @@
+"""
+Unit tests for internal domain models.
+"""
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.models.schemas import (
+    CompiledRankingRules,
+    TagVocabulary,
+    TenantRankingRules,
+    UserSignals,
+    VideoMetadata,
+)
+
+
+class TestVideoMetadata:
+    def test_slotted_without_instance_dict(self, sample_video):
+        """Hot-path candidates are slotted dataclasses, not Pydantic models."""
+        assert not hasattr(sample_video, "__dict__")
+
+    def test_score_validated_at_load_time(self):
+        """Out-of-range scores are rejected when the candidate is built."""
+        with pytest.raises(ValueError):
+            VideoMetadata(id="v1", title="t", score=101, published_at=0)
+
+    def test_derived_fields(self):
+        """Tags are normalized to a tuple; tag bits wait for a vocabulary."""
+        video = VideoMetadata(
+            id="v1", title="t", score=50, published_at=0, tags=["sports", "news"]
+        )
+
+        assert video.tags == ("sports", "news")
+        assert video.tag_vocab is None and video.tag_bits == 0
+        assert video.playback_url.endswith("/v1.m3u8")
+
+    def test_with_tag_vocabulary_binds_a_copy(self):
+        """Binding interns tags into the vocabulary on a copy of the video."""
+        video = VideoMetadata(
+            id="v1", title="t", score=50, published_at=0, tags=["news", "sports"]
+        )
+        vocab = TagVocabulary()
+
+        bound = video.with_tag_vocabulary(vocab)
+
+        assert bound == video and bound is not video
+        assert bound.tag_vocab is vocab
+        assert bound.tag_bits == 0b11
+        assert len(vocab) == 2
+        assert video.tag_vocab is None
+
+    def test_id_interned(self):
+        """Ids built at runtime share the interned string object."""
+        video = VideoMetadata(
+            id="".join(["v", "42"]), title="t", score=50, published_at=0
+        )
+
+        assert video.id is sys.intern("v42")
+
+
+class TestUserSignals:
+    def test_watched_set_interned(self):
+        """Watched ids are interned so probes with video ids match by identity."""
+        user = UserSignals(user_hash="u1", watched_ids=["".join(["v", "42"])])
+
+        assert next(iter(user.watched_set)) is sys.intern("v42")
+
+    def test_cold_start_follows_reassigned_signals(self):
+        """is_cold_start reflects the current history, not the loaded one."""
+        user = UserSignals.cold_start("u1")
+        assert user.is_cold_start
+
+        user.watched_ids = ["v1"]
+
+        assert not user.is_cold_start
+
+    def test_affinity_mask_tracks_new_tags(self):
+        """A cached mask picks up tags interned after it was built."""
+        user = UserSignals(user_hash="u1", affinities={"late-tag": 0.5})
+        vocab = TagVocabulary()
+        assert user.affinity_mask(vocab) == 0
+
+        video = VideoMetadata(
+            id="v1", title="t", score=50, published_at=0, tags=["late-tag"]
+        ).with_tag_vocabulary(vocab)
+
+        assert user.affinity_mask(vocab) & video.tag_bits
+
+
+class TestCompiledRankingRules:
+    def test_resolves_typed_fields(self):
+        """Weights and filters are resolved from the config dicts once."""
+        rules = CompiledRankingRules.from_rules(
+            TenantRankingRules(
+                tenant_id="t1",
+                boost_weights={"recency": 2.0},
+                filters={"max_maturity": "PG", "exclude_tags": ["sports"]},
+            )
+        )
+
+        assert rules.w_recency == 2.0
+        assert rules.w_affinity == 1.0  # Missing weights default to 1.0
+        assert rules.blocked_ratings == {"PG-13", "R", "NC-17"}
+        assert rules.exclude_tags == {"sports"}
+
+    def test_no_filters(self):
+        """An empty filter dict disables both content filters."""
+        rules = CompiledRankingRules.from_rules(TenantRankingRules(tenant_id="t1"))
+
+        assert not rules.exclude_tags
+        assert not rules.blocked_ratings
+
+
+class TestTagVocabulary:
+    def test_concurrent_interning_assigns_distinct_bits(self):
+        """Tags interned from many threads never share a bit."""
+        vocab = TagVocabulary()
+        tags = [f"tag{i}" for i in range(200)]
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            masks = list(pool.map(lambda t: vocab.mask([t], intern=True), tags))
+
+        assert len(set(masks)) == len(tags)
+        assert all(mask & (mask - 1) == 0 for mask in masks)  # One bit each
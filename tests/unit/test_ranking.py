@@ -1,10 +1,20 @@
 """
 Unit tests for RankingEngine service.
 """
+import base64
+import struct
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.core.cache import InMemoryCache
 from app.models.schemas import (
+    ScoredVideo,
+    TagVocabulary,
     VideoMetadata,
 )
-from app.services.ranking import RankingEngine
+from app.services.ranking import AffinityScoring, RankingEngine, RecencyScoring
 
 
 class TestRankingEngine:
@@ -35,12 +45,37 @@ class TestRankingEngine:
         assert not has_more
         assert next_cursor is None
 
+    def test_debug_breakdown_ranks_identically(
+            self, sample_video, sample_user_signals, sample_config
+    ):
+        """Test breakdown collection does not change results."""
+        plain = RankingEngine()
+        debug = RankingEngine(debug_breakdown=True)
+
+        plain_items, _, _ = plain.rank(
+            candidates=[sample_video], user=sample_user_signals, config=sample_config
+        )
+        debug_items, _, _ = debug.rank(
+            candidates=[sample_video], user=sample_user_signals, config=sample_config
+        )
+
+        assert [i.id for i in debug_items] == [i.id for i in plain_items]
+        assert abs(debug_items[0].debug_score - plain_items[0].debug_score) < 0.1
+
     def test_filtering_watched_videos(
             self, sample_video, sample_user_signals, sample_config
     ):
         """Test that watched videos are excluded."""
         engine = RankingEngine()
 
+        # Rank once so the cached watched set is built
+        items, _, _ = engine.rank(
+            candidates=[sample_video],
+            user=sample_user_signals,
+            config=sample_config,
+        )
+        assert len(items) == 1
+
         # User has watched this video
         sample_user_signals.watched_ids = [sample_video.id]
 
@@ -52,6 +87,16 @@ class TestRankingEngine:
 
         assert len(items) == 0
 
+    def test_watched_set_reused_across_calls(self, sample_user_signals):
+        """Test the membership set is built once per watched_ids object."""
+        first = sample_user_signals.watched_set
+
+        assert sample_user_signals.watched_set is first
+
+        sample_user_signals.watched_ids = frozenset(["v1"])
+        # frozenset inputs are used as-is
+        assert sample_user_signals.watched_set is sample_user_signals.watched_ids
+
     def test_filtering_maturity(
             self, sample_video, sample_user_signals, sample_config
     ):
@@ -81,6 +126,62 @@ class TestRankingEngine:
         )
         assert len(items_ok) == 1
 
+    def test_filtering_maturity_unknown_ratings(
+            self, sample_video, sample_user_signals, sample_config
+    ):
+        """Test unknown ratings are never blocked and unknown limits are ignored."""
+        engine = RankingEngine()
+
+        sample_video.maturity_rating = "TV-MA"
+        sample_config.filters["max_maturity"] = "G"
+        items, _, _ = engine.rank(
+            candidates=[sample_video], user=sample_user_signals, config=sample_config
+        )
+        assert len(items) == 1
+
+        sample_video.maturity_rating = "NC-17"
+        sample_config.filters["max_maturity"] = "unrated"
+        items, _, _ = engine.rank(
+            candidates=[sample_video], user=sample_user_signals, config=sample_config
+        )
+        assert len(items) == 1
+
+    def test_mixed_tag_vocabularies_rebound(
+            self, sample_video, sample_user_signals, sample_config
+    ):
+        """Test pools mixing tag vocabularies are ranked on bound copies."""
+        other = VideoMetadata(
+            id="v2", title="t", score=50, published_at=0, tags=["news"]
+        ).with_tag_vocabulary(TagVocabulary())
+        candidates = [sample_video.with_tag_vocabulary(TagVocabulary()), other]
+        vocabs = [video.tag_vocab for video in candidates]
+        sample_config.filters["exclude_tags"] = ["news"]
+
+        items, _, _ = RankingEngine().rank(
+            candidates=candidates,
+            user=sample_user_signals,
+            config=sample_config,
+        )
+
+        assert [i.id for i in items] == ["v1"]
+        # The caller's videos keep their own vocabularies
+        assert [video.tag_vocab for video in candidates] == vocabs
+
+    def test_filtering_excluded_tags(
+            self, sample_video, sample_user_signals, sample_config
+    ):
+        """Test exclude_tags filter (tag bitmask match)."""
+        engine = RankingEngine()
+        sample_config.filters["exclude_tags"] = ["sports", "never-seen-tag"]
+
+        items, _, _ = engine.rank(
+            candidates=[sample_video],
+            user=sample_user_signals,
+            config=sample_config,
+        )
+
+        assert len(items) == 0
+
     def test_pagination(
             self, sample_user_signals, sample_config
     ):
@@ -123,3 +224,191 @@ class TestRankingEngine:
         assert len(p2_items) == 3
         assert p2_items[0].id == "v3"  # 0,1,2 were page 1
         assert p2_more is True
+
+    def test_page_cache_reuses_scored_pool(self, sample_user_signals, sample_config):
+        """Test follow-up pages reuse the cached pool until inputs change."""
+        engine = RankingEngine(page_cache=InMemoryCache())
+        engine._filter_candidates = MagicMock(wraps=engine._filter_candidates)
+        candidates = [
+            VideoMetadata(
+                id=f"v{i}", title="t", score=100 - i, published_at=1700000000
+            )
+            for i in range(10)
+        ]
+
+        p1_items, p1_cursor, _ = engine.rank(
+            candidates=candidates,
+            user=sample_user_signals,
+            config=sample_config,
+            limit=3,
+        )
+        pool = engine._page_cache.get(engine._pool_key(sample_user_signals, candidates))
+        # First pages use top-k selection; the full sort waits for page 2
+        assert pool.order is None
+        p2_items, _, _ = engine.rank(
+            candidates=candidates,
+            user=sample_user_signals,
+            config=sample_config,
+            limit=3,
+            cursor=p1_cursor,
+        )
+
+        assert [i.id for i in p1_items + p2_items] == [f"v{i}" for i in range(6)]
+        assert pool.order is not None
+        assert engine._filter_candidates.call_count == 1
+
+        # New watch history invalidates the cached pool
+        sample_user_signals.watched_ids = ["v0"]
+        items, _, _ = engine.rank(
+            candidates=candidates,
+            user=sample_user_signals,
+            config=sample_config,
+            limit=3,
+        )
+
+        assert items[0].id == "v1"
+        assert engine._filter_candidates.call_count == 2
+
+    def test_cursor_round_trip(self):
+        """Test cursors are opaque, round-trip, and reject garbage."""
+        engine = RankingEngine()
+
+        cursor = engine._encode_cursor(40)
+
+        assert engine._decode_cursor(cursor) == 40
+        assert engine._decode_cursor("not-a-cursor") == 0
+        # Unknown format versions are rejected rather than misread
+        future = base64.urlsafe_b64encode(struct.pack("<BQ", 2, 40)).decode("ascii")
+        assert engine._decode_cursor(future) == 0
+
+    def test_default_fast_path_matches_generic_scoring(
+            self, sample_user_signals, sample_config
+    ):
+        """Test the fused default scorer ranks like the generic strategy loop."""
+
+        class GenericRecency(RecencyScoring):
+            """Subclass opts out of the fused fast path."""
+
+        candidates = [
+            VideoMetadata(
+                id=f"v{i}",
+                title=f"Video {i}",
+                score=50 + (i * 7) % 40,
+                published_at=int(time.time()) - i * 3600,
+                tags=["sports"] if i % 3 == 0 else ["news"],
+            )
+            for i in range(12)
+        ]
+        fast = RankingEngine()
+        generic = RankingEngine([GenericRecency(), AffinityScoring()])
+
+        fast_items, _, _ = fast.rank(
+            candidates=candidates, user=sample_user_signals, config=sample_config
+        )
+        generic_items, _, _ = generic.rank(
+            candidates=candidates, user=sample_user_signals, config=sample_config
+        )
+
+        assert [i.id for i in fast_items] == [i.id for i in generic_items]
+
+    def test_select_top_matches_full_sort(self, sample_config):
+        """Test bounded heap selection returns the head of a full sort."""
+        candidates = [
+            VideoMetadata(id=f"v{i}", title="t", score=50, published_at=0)
+            for i in range(50)
+        ]
+        final_scores = [float((i * 37) % 101) for i in range(50)]
+        expected = sorted(range(50), key=final_scores.__getitem__, reverse=True)
+
+        for count in (1, 3, 50, 80):
+            top = RankingEngine._select_top(
+                candidates, final_scores, count, sample_config
+            )
+            assert top == expected[:count]
+
+    def test_only_served_items_are_materialized(
+            self, sample_user_signals, sample_config
+    ):
+        """Test ScoredVideo is built only for the page, not per candidate."""
+        engine = RankingEngine()
+        candidates = [
+            VideoMetadata(id=f"v{i}", title="t", score=100 - i, published_at=0)
+            for i in range(20)
+        ]
+        sample_user_signals.watched_ids = ["v0", "v1"]
+
+        with patch("app.services.ranking.ScoredVideo", wraps=ScoredVideo) as scored:
+            items, cursor, _ = engine.rank(
+                candidates=candidates,
+                user=sample_user_signals,
+                config=sample_config,
+                limit=3,
+            )
+            engine.rank(
+                candidates=candidates,
+                user=sample_user_signals,
+                config=sample_config,
+                limit=3,
+                cursor=cursor,
+            )
+
+        assert [item.id for item in items] == ["v2", "v3", "v4"]
+        # Two pages of three; filtered and lower-ranked candidates never built
+        assert scored.call_count == 6
+
+    def test_editorial_boost_pins_low_score_video(
+            self, sample_user_signals, sample_config
+    ):
+        """Test editorial boosts survive top-k selection and pagination."""
+        engine = RankingEngine()
+
+        candidates = [
+            VideoMetadata(
+                id=f"v{i}",
+                title=f"Video {i}",
+                score=100 - i,
+                published_at=1700000000,
+            )
+            for i in range(10)
+        ]
+        # Lowest scoring video pinned to the top
+        sample_config.editorial_boosts = {"v9": 0}
+
+        p1_items, p1_cursor, _ = engine.rank(
+            candidates=candidates,
+            user=sample_user_signals,
+            config=sample_config,
+            limit=3,
+        )
+        assert [item.id for item in p1_items] == ["v9", "v0", "v1"]
+
+        p2_items, _, _ = engine.rank(
+            candidates=candidates,
+            user=sample_user_signals,
+            config=sample_config,
+            limit=3,
+            cursor=p1_cursor,
+        )
+        assert [item.id for item in p2_items] == ["v2", "v3", "v4"]
+
+
+class TestRecencyScoring:
+    def test_batch_linear_decay(self, sample_user_signals, sample_config):
+        """Boost decays linearly from the weight to 0 over DECAY_HOURS."""
+        now = int(time.time())
+        decay_seconds = RecencyScoring.DECAY_HOURS * 3600
+        videos = [
+            VideoMetadata(id="fresh", title="t", score=50, published_at=now + 60),
+            VideoMetadata(
+                id="half", title="t", score=50, published_at=now - decay_seconds // 2
+            ),
+            VideoMetadata(id="old", title="t", score=50, published_at=now - decay_seconds),
+        ]
+
+        boosts = RecencyScoring().calculate_boost_batch(
+            videos, sample_user_signals, sample_config
+        )
+
+        assert boosts[0] == 1.0
+        assert abs(boosts[1] - 0.5) < 0.01
+        assert boosts[2] == 0.0
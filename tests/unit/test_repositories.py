@@ -0,0 +1,75 @@
+"""
+Unit tests for in-memory repositories.
+"""
+import pytest
+
+from app.models.schemas import VideoMetadata
+from app.repositories.memory import (
+    InMemoryCandidateRepository,
+    InMemoryUserSignalRepository,
+)
+
+
+class TestInMemoryCandidateRepository:
+    @pytest.mark.asyncio
+    async def test_save_candidates_bumps_version(self):
+        repo = InMemoryCandidateRepository()
+        version = repo.get_version()
+
+        videos = await repo.get_candidates("tenant_sports")
+        await repo.save_candidates("tenant_sports", videos[:2])
+
+        assert repo.get_version() > version
+        assert len(await repo.get_candidates("tenant_sports")) == 2
+        assert len(await repo.get_fallback_feed("tenant_sports")) == 2
+
+    @pytest.mark.asyncio
+    async def test_get_candidates_respects_limit(self):
+        repo = InMemoryCandidateRepository()
+
+        videos = await repo.get_candidates("tenant_sports", limit=2)
+
+        assert len(videos) == 2
+        # The bounded pool is sliced once, not per request
+        assert await repo.get_candidates("tenant_sports", limit=2) is videos
+
+
+    @pytest.mark.asyncio
+    async def test_tenants_get_separate_tag_vocabularies(self):
+        repo = InMemoryCandidateRepository()
+
+        sports = await repo.get_candidates("tenant_sports")
+        news = await repo.get_candidates("tenant_news")
+
+        assert sports[0].tag_vocab is not news[0].tag_vocab
+        # Reloading a tenant rebuilds its vocabulary from the new pool only
+        await repo.save_candidates("tenant_sports", sports[2:3])
+        (reloaded,) = await repo.get_candidates("tenant_sports")
+        assert len(reloaded.tag_vocab) == len(reloaded.tags)
+
+    @pytest.mark.asyncio
+    async def test_saved_videos_can_sit_in_several_pools(self):
+        repo = InMemoryCandidateRepository()
+        video = VideoMetadata(
+            id="v1", title="t", score=50, published_at=0, tags=["sports"]
+        )
+
+        await repo.save_candidates("t1", [video])
+        await repo.save_candidates("t2", [video])
+        (first,) = await repo.get_candidates("t1")
+        (second,) = await repo.get_candidates("t2")
+
+        # Each pool holds its own bound copy; the caller's video is untouched
+        assert video.tag_vocab is None
+        assert first.tag_vocab is not second.tag_vocab
+
+
+class TestInMemoryUserSignalRepository:
+    @pytest.mark.asyncio
+    async def test_unknown_user_gets_cold_start_signals(self):
+        repo = InMemoryUserSignalRepository()
+
+        signals = await repo.get_signals("user_unknown")
+
+        assert signals.user_hash == "user_unknown"
+        assert signals.is_cold_start